@@ -0,0 +1,58 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional, List
+from datetime import datetime
+import asyncio
+import tempfile
+from ..persistence.repository import Repository
+from ..persistence.archive import export_archive, import_archive, compressions
+from ..core.memory_store import MemoryStore
+from .deps import get_repo, get_memory
+
+router = APIRouter(prefix="/v1", tags=["archive"])
+
+SPOOL_LIMIT = 32 * 1024 * 1024         # Uploads larger than this spill to a temp file
+
+@router.get("/export")
+async def export_data(session_id: Optional[str] = None, folder_id: Optional[str] = None,
+                      compression: str = "gzip", repo: Repository = Depends(get_repo)):
+    """Streams one session, one folder, or (with neither) all data as a .tar.gz / .tar.zst."""
+    if compression not in compressions():
+        raise HTTPException(status_code=400, detail=f"Compression must be one of {compressions()}")
+    if session_id:
+        if not (repo.sessions_dir / session_id).is_dir():
+            raise HTTPException(status_code=404, detail="Session not found")
+        session_ids, label = [session_id], session_id
+    elif folder_id:
+        folder = repo.load_folders().get(folder_id)
+        if not folder:
+            raise HTTPException(status_code=404, detail="Folder not found")
+        session_ids, label = folder.get("sessions", []), folder_id
+    else:
+        session_ids, label = None, "all"
+
+    extension = "tar.zst" if compression == "zstd" else "tar.gz"
+    filename = f"localagent-{label}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{extension}"
+    return StreamingResponse(
+        export_archive(repo, session_ids, compression),
+        media_type="application/zstd" if compression == "zstd" else "application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post("/import")
+async def import_data(request: Request, session_id: Optional[List[str]] = Query(None),
+                      repo: Repository = Depends(get_repo), memory: MemoryStore = Depends(get_memory)):
+    """Restores an export. Pass session_id (repeatable) to re-import only those sessions."""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_LIMIT) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        if upload.tell() == 0:
+            raise HTTPException(status_code=400, detail="Archive is empty")
+        upload.seek(0)
+        try:
+            stats = await asyncio.to_thread(import_archive, repo, upload, session_id)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Could not read archive: {e}")
+    if not session_id:
+        memory.reload()
+    return {"status": "imported", **stats}
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse, FileResponse
+from typing import Optional
+from ..core.batch import BatchRunner
+from ..persistence.codec import codec
+from .deps import get_batch_runner
+
+router = APIRouter(prefix="/v1/batch", tags=["batch"])
+
+@router.post("")
+async def create_batch(request: Request, concurrency: Optional[int] = None, model: Optional[str] = None,
+                       runner: BatchRunner = Depends(get_batch_runner)):
+    """Body is JSONL, one {"session_id", "message", "model"?} object per line."""
+    try:
+        return await runner.create_job(request.stream(), concurrency, model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("")
+async def list_batches(runner: BatchRunner = Depends(get_batch_runner)):
+    return {"jobs": runner.list_jobs()}
+
+@router.get("/{job_id}")
+async def get_batch(job_id: str, runner: BatchRunner = Depends(get_batch_runner)):
+    state = runner.get_state(job_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return state
+
+@router.get("/{job_id}/events")
+async def batch_events(job_id: str, runner: BatchRunner = Depends(get_batch_runner)):
+    """Server-sent events with the job state after every finished item."""
+    if not runner.get_state(job_id):
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    async def stream():
+        async for state in runner.watch(job_id):
+            yield b"data: " + codec.encode(state) + b"\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+@router.get("/{job_id}/results")
+async def batch_results(job_id: str, runner: BatchRunner = Depends(get_batch_runner)):
+    output_file = runner.output_file(job_id)
+    if not output_file.exists():
+        raise HTTPException(status_code=404, detail="No results yet")
+    return FileResponse(output_file, media_type="application/x-ndjson", filename=f"{job_id}.jsonl")
+
+@router.post("/{job_id}/resume")
+async def resume_batch(job_id: str, runner: BatchRunner = Depends(get_batch_runner)):
+    if not runner.start(job_id):
+        raise HTTPException(status_code=409, detail="Batch is running, completed or unknown")
+    return {"status": "resumed", "job_id": job_id}
+
+@router.delete("/{job_id}")
+async def cancel_batch(job_id: str, runner: BatchRunner = Depends(get_batch_runner)):
+    if not runner.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Batch is not running")
+    return {"status": "cancelled", "job_id": job_id}
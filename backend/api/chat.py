@@ -2,11 +2,9 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional
 from ..core.agent import LocalAgent
-from ..persistence.repository import Repository
+from .deps import get_agent
 
 router = APIRouter(prefix="/v1/chat", tags=["chat"])
-repo = Repository()
-agent = LocalAgent(repo)
 
 class ChatRequest(BaseModel):
     message: str
@@ -14,7 +12,7 @@ class ChatRequest(BaseModel):
     model: Optional[str] = None
 
 @router.post("")
-async def chat(req: ChatRequest):
+async def chat(req: ChatRequest, agent: LocalAgent = Depends(get_agent)):
     reply = await agent.chat(req.session_id, req.message, req.model)
     return {
         "reply": reply,
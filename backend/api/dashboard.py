@@ -1,13 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from ..persistence.repository import Repository
+from .deps import get_repo
 import json
 from pathlib import Path
 
 router = APIRouter(prefix="/v1/dashboard", tags=["dashboard"])
-repo = Repository()
 
 @router.get("")
-async def get_dashboard_config():
+async def get_dashboard_config(repo: Repository = Depends(get_repo)):
     config_file = repo.data_dir / "dashboard.json"
     if not config_file.exists():
         default_config = {
@@ -30,11 +30,12 @@ async def get_dashboard_config():
         return json.load(f)
 
 @router.get("/stats")
-async def get_dashboard_stats():
+async def get_dashboard_stats(repo: Repository = Depends(get_repo)):
     sessions = repo.list_sessions()
     total_sessions = len(sessions)
     total_messages = 0
     active_prompts = 0
+    total_recordings = 0
     
     for s in sessions:
         msgs = repo.load_messages(s.session_id)
@@ -43,10 +44,12 @@ async def get_dashboard_stats():
         prompt = repo.get_active_prompt(s.session_id)
         if prompt:
             active_prompts += 1
+
+        total_recordings += sum(1 for r in repo.load_recordings(s.session_id) if r.status == "complete")
             
     return {
         "totalSessions": total_sessions,
         "totalMessages": total_messages,
-        "totalRecordings": 0, # TODO: Integrate with voice service
+        "totalRecordings": total_recordings,
         "activePrompts": active_prompts
     }
@@ -0,0 +1,28 @@
+from fastapi import Request
+from ..persistence.repository import Repository
+from ..core.agent import LocalAgent
+from ..core.scheduler import Scheduler
+from ..core.batch import BatchRunner
+from ..core.events import EventBus
+from ..core.memory_store import MemoryStore
+
+# App-scoped singletons. main.py creates them in its lifespan hook and stores
+# them on app.state; routers pull them in with Depends().
+
+def get_repo(request: Request) -> Repository:
+    return request.app.state.repo
+
+def get_agent(request: Request) -> LocalAgent:
+    return request.app.state.agent
+
+def get_scheduler(request: Request) -> Scheduler:
+    return request.app.state.scheduler
+
+def get_batch_runner(request: Request) -> BatchRunner:
+    return request.app.state.batch_runner
+
+def get_events(request: Request) -> EventBus:
+    return request.app.state.events
+
+def get_memory(request: Request) -> MemoryStore:
+    return request.app.state.memory
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+from ..core.events import EventBus, TOPICS
+from ..persistence.codec import codec
+from .deps import get_events
+
+router = APIRouter(prefix="/v1/events", tags=["events"])
+
+# Events are sent in batches at most this often, so bursts coalesce
+FLUSH_INTERVAL = 0.1
+
+def _topics(topics: Optional[str]):
+    return [t for t in (topics or "").split(",") if t in TOPICS]
+
+@router.get("")
+async def stream_events(request: Request, topics: Optional[str] = None, session_id: Optional[str] = None,
+                        bus: EventBus = Depends(get_events)):
+    """Server-sent events. Each message is a JSON array of events."""
+    sub = bus.subscribe(_topics(topics), session_id)
+
+    async def stream():
+        try:
+            yield b"retry: 2000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    batch = await asyncio.wait_for(sub.next_batch(), 15)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"data: " + codec.encode(batch) + b"\n\n"
+                await asyncio.sleep(FLUSH_INTERVAL)
+        finally:
+            sub.close()
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+@router.websocket("/ws")
+async def events_socket(websocket: WebSocket, topics: Optional[str] = None, session_id: Optional[str] = None):
+    """WebSocket feed. Clients may send {"subscribe": [...], "unsubscribe": [...], "session_id": ...}."""
+    bus: EventBus = websocket.app.state.events
+    await websocket.accept()
+    sub = bus.subscribe(_topics(topics), session_id)
+
+    async def receive():
+        while True:
+            msg = await websocket.receive_json()
+            sub.topics |= set(_topics(",".join(msg.get("subscribe", []))))
+            sub.topics -= set(msg.get("unsubscribe", []))
+            if "session_id" in msg:
+                sub.session_id = msg["session_id"]
+
+    receiver = asyncio.create_task(receive())
+    try:
+        while not receiver.done():
+            batch_task = asyncio.create_task(sub.next_batch())
+            await asyncio.wait({batch_task, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if not batch_task.done():
+                batch_task.cancel()
+                break
+            await websocket.send_text(codec.encode(batch_task.result()).decode("utf-8"))
+            await asyncio.sleep(FLUSH_INTERVAL)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        sub.close()
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+import asyncio
+from ..core.file_index import file_index
+
+router = APIRouter(prefix="/v1/files", tags=["files"])
+
+# Index queries are blocking SQLite reads, so these routes run in the threadpool
+
+@router.get("/search")
+def search_files(q: str, limit: int = 10):
+    return {"results": file_index.search(q, limit)}
+
+@router.get("/read")
+def read_file(path: str, offset: int = 0, max_chars: int = 8000):
+    try:
+        return file_index.read(path, offset, max_chars)
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+@router.post("/reindex")
+async def reindex(root: Optional[str] = None):
+    try:
+        roots = [file_index.add_root(root)] if root else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    stats = await asyncio.to_thread(file_index.refresh, roots)
+    return {"status": "indexed", **stats}
+
+@router.get("/status")
+def index_status():
+    return file_index.status()
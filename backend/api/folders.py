@@ -1,19 +1,19 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from ..persistence.repository import Repository
+from .deps import get_repo
 import uuid
 
 router = APIRouter(prefix="/v1/folders", tags=["folders"])
-repo = Repository()
 
 @router.get("")
-async def list_folders():
+async def list_folders(repo: Repository = Depends(get_repo)):
     return repo.list_folders()
 
 @router.post("")
-async def create_folder(name: str):
+async def create_folder(name: str, repo: Repository = Depends(get_repo)):
     folder_id = f"folder-{uuid.uuid4().hex[:8]}"
     return repo.create_folder(folder_id, name)
 
 @router.get("/{folder_id}/sessions")
-async def get_folder_sessions(folder_id: str):
+async def get_folder_sessions(folder_id: str, repo: Repository = Depends(get_repo)):
     return repo.list_sessions(folder_id)
@@ -1,12 +1,12 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from ..persistence.repository import Repository
+from .deps import get_repo
 import json
 
 router = APIRouter(prefix="/v1/sessions", tags=["linkbio"])
-repo = Repository()
 
 @router.get("/{session_id}/links")
-async def get_links(session_id: str):
+async def get_links(session_id: str, repo: Repository = Depends(get_repo)):
     links_file = repo.sessions_dir / session_id / "links.json"
     if not links_file.exists():
         return {"links": []}
@@ -14,7 +14,7 @@ async def get_links(session_id: str):
         return json.load(f)
 
 @router.get("/{session_id}/linkbio-profile")
-async def get_profile(session_id: str):
+async def get_profile(session_id: str, repo: Repository = Depends(get_repo)):
     profile_file = repo.sessions_dir / session_id / "linkbio-profile.json"
     if not profile_file.exists():
         return {"name": "Model Profile", "bio": "Links and resources"}
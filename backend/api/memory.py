@@ -1,39 +1,29 @@
-from fastapi import APIRouter, HTTPException
-from ..persistence.repository import Repository
-import json
-import uuid
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends
+from ..core.memory_store import MemoryStore
+from .deps import get_memory
 
 router = APIRouter(prefix="/v1/memory", tags=["memory"])
-repo = Repository()
 
 @router.get("")
-async def get_memory():
-    memory_file = repo.data_dir / "memory.jsonl"
-    if not memory_file.exists():
-        return {"memories": [], "count": 0}
-    
-    memories = []
-    try:
-        with open(memory_file, 'r') as f:
-            for line in f:
-                if line.strip():
-                    memories.append(json.loads(line))
-    except Exception:
-        pass
-    return {"memories": memories[-100:], "count": len(memories)}
+async def get_memory_entries(memory: MemoryStore = Depends(get_memory)):
+    # The first access loads memory.jsonl; keep that off the event loop
+    memories = await memory.run(memory.recent, 100)
+    return {"memories": memories, "count": len(memory.entries)}
 
 @router.post("")
-async def add_memory(fact: str, category: str = "general", source_session: str = None):
-    memory_file = repo.data_dir / "memory.jsonl"
-    entry = {
-        "id": f"mem-{uuid.uuid4().hex[:8]}",
-        "fact": fact,
-        "category": category,
-        "source_session": source_session,
-        "created_at": datetime.now().isoformat(),
-        "relevance_count": 0
-    }
-    with open(memory_file, 'a') as f:
-        f.write(json.dumps(entry) + '\n')
-    return {"memory": entry}
+async def add_memory(fact: str, category: str = "general", source_session: str = None,
+                     memory: MemoryStore = Depends(get_memory)):
+    # Near-duplicates of a stored fact are merged into it (relevance_count goes up)
+    entry, merged = await memory.run(memory.add, fact, category, source_session)
+    return {"memory": entry, "merged": merged}
+
+@router.delete("/{memory_id}")
+async def delete_memory(memory_id: str, memory: MemoryStore = Depends(get_memory)):
+    if not await memory.run(memory.remove, memory_id):
+        raise HTTPException(status_code=404, detail="Memory not found")
+    return {"status": "removed"}
+
+@router.post("/compact")
+async def compact_memory(memory: MemoryStore = Depends(get_memory)):
+    """Rewrites memory.jsonl with one line per entry, duplicates merged."""
+    return await memory.run(memory.compact)
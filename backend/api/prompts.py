@@ -1,19 +1,36 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Optional
 from ..persistence.repository import Repository
-from ..persistence.models import Prompt
+from ..core.scheduler import Scheduler
+from .deps import get_repo, get_scheduler
+from .schedule import parse_due_at, check_interval
+from ..core.file_index import file_index
+from ..persistence.models import Prompt, PromptType
 from datetime import datetime
+from pathlib import Path
+import asyncio
 import uuid
 
 router = APIRouter(prefix="/v1/sessions", tags=["prompts"])
-repo = Repository()
+
+def _existing_path(content: str) -> bool:
+    """Whether READ content names a file or folder (it may just as well be text)."""
+    try:
+        return Path(content).expanduser().exists()
+    except (OSError, ValueError, RuntimeError):
+        # Too long for a path, contains NUL, or names an unknown ~user
+        return False
 
 @router.get("/{session_id}/prompts")
-async def get_prompts(session_id: str):
+async def get_prompts(session_id: str, repo: Repository = Depends(get_repo)):
     prompts = repo.load_prompts(session_id)
     return {"active_prompts": [p.to_dict() for p in prompts]}
 
 @router.post("/{session_id}/prompts")
-async def add_prompt(session_id: str, prompt_type: str, name: str, content: str):
+async def add_prompt(session_id: str, prompt_type: str, name: str, content: str,
+                     run_at: Optional[str] = None, delay_seconds: Optional[float] = None,
+                     interval_seconds: Optional[float] = None,
+                     repo: Repository = Depends(get_repo), scheduler: Scheduler = Depends(get_scheduler)):
     prompt = Prompt(
         id=f"prompt-{uuid.uuid4().hex[:8]}",
         type=prompt_type,
@@ -23,13 +40,50 @@ async def add_prompt(session_id: str, prompt_type: str, name: str, content: str)
         created_at=datetime.now().isoformat(),
         metadata={}
     )
+
+    # SCHEDULE runs the content as an agent turn at run_at (optionally repeating);
+    # TIME_TARGET fires a wrap-up turn when the deadline passes
+    if prompt_type in (PromptType.SCHEDULE.value, PromptType.TIME_TARGET.value):
+        if not run_at and delay_seconds is None:
+            raise HTTPException(status_code=400, detail="run_at or delay_seconds is required for this prompt type")
+        check_interval(interval_seconds)
+        due_at = parse_due_at(run_at, delay_seconds)
+        if prompt_type == PromptType.SCHEDULE.value:
+            message = content
+            interval = interval_seconds
+        else:
+            message = f"The deadline for this task has been reached: {content}. Summarize what was completed and what remains."
+            interval = None
+        job = scheduler.schedule(session_id, due_at, "agent_turn", {"message": message},
+                                 prompt_id=prompt.id, interval=interval)
+        prompt.metadata = {
+            "job_id": job.id,
+            "run_at": datetime.fromtimestamp(due_at).isoformat(),
+            "interval_seconds": interval,
+        }
+
+    # FORBIDDEN_WORDS content is a comma-separated list; the agent masks these in replies
+    if prompt_type == PromptType.FORBIDDEN_WORDS.value:
+        prompt.metadata = {"words": [w.strip() for w in content.split(",") if w.strip()]}
+
+    # READ prompts point at a file or folder: make it searchable before the next turn
+    if prompt_type == PromptType.READ.value and _existing_path(content):
+        try:
+            root = file_index.add_root(content)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        stats = await asyncio.to_thread(file_index.refresh, [root])
+        prompt.metadata = {"path": str(root), "indexed_files": stats["scanned"]}
+
     repo.add_prompt(session_id, prompt)
     # repo.log_activity(session_id, "prompt_activated", {"prompt_name": name})
     return prompt.to_dict()
 
 @router.delete("/{session_id}/prompts/{prompt_id}")
-async def remove_prompt(session_id: str, prompt_id: str):
+async def remove_prompt(session_id: str, prompt_id: str, repo: Repository = Depends(get_repo),
+                        scheduler: Scheduler = Depends(get_scheduler)):
     prompts = repo.load_prompts(session_id)
     updated = [p for p in prompts if p.id != prompt_id]
     repo.save_prompts(session_id, updated)
+    scheduler.cancel_for_prompt(session_id, prompt_id)
     return {"status": "removed"}
@@ -0,0 +1,179 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import FileResponse
+from typing import Optional, Dict
+from pathlib import Path
+from datetime import datetime
+import os
+import asyncio
+import mimetypes
+import uuid
+from ..persistence.repository import Repository
+from ..persistence.models import Recording
+from ..core.audio_probe import probe
+from .deps import get_repo
+
+router = APIRouter(prefix="/v1/sessions", tags=["recordings"])
+
+# Largest recording accepted, in bytes
+RECORDINGS_MAX_BYTES = int(os.getenv("RECORDINGS_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+WRITE_BUFFER = 1024 * 1024             # Request chunks are gathered into writes of this size
+
+# One upload request at a time per recording, so offsets can't interleave
+_upload_locks: Dict[str, asyncio.Lock] = {}
+
+class RecordingResponse(FileResponse):
+    # Larger reads than Starlette's 64 KB default for multi-hundred-MB files
+    chunk_size = 1024 * 1024
+
+def _file(repo: Repository, rec: Recording) -> Path:
+    return repo.recordings_dir(rec.session_id) / rec.filename
+
+def _part_file(repo: Repository, rec: Recording) -> Path:
+    return repo.recordings_dir(rec.session_id) / f"{rec.filename}.part"
+
+def _get_or_404(repo: Repository, session_id: str, recording_id: str) -> Recording:
+    rec = repo.get_recording(session_id, recording_id)
+    if rec is None:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    return rec
+
+async def _receive(request: Request, rec: Recording, part: Path, offset: int) -> int:
+    """Streams the request body into the part file at offset. Returns the new size.
+
+    Whatever arrived before a dropped connection stays on disk, so the
+    client can ask for the offset and resume from there.
+    """
+    limit = rec.expected_size or RECORDINGS_MAX_BYTES
+    buffer = bytearray()
+    with open(part, "r+b") as f:
+        f.seek(offset)
+        try:
+            async for chunk in request.stream():
+                buffer += chunk
+                if offset + len(buffer) > limit:
+                    raise HTTPException(status_code=413, detail=f"Recording exceeds {limit} bytes")
+                if len(buffer) >= WRITE_BUFFER:
+                    f.write(buffer)
+                    offset += len(buffer)
+                    buffer.clear()
+        finally:
+            if buffer and offset + len(buffer) <= limit:
+                f.write(buffer)
+                offset += len(buffer)
+    return offset
+
+async def _finish(repo: Repository, rec: Recording) -> Recording:
+    """Fills in duration and codec from the header and moves the part file into place."""
+    target = _file(repo, rec)
+    # Probe first: once the part file is gone, a failure here could not be retried
+    part = _part_file(repo, rec)
+    info = await asyncio.to_thread(probe, part)
+    part.replace(target)
+    rec.status = "complete"
+    rec.size = target.stat().st_size
+    rec.duration = info.get("duration", rec.duration)
+    rec.codec = info.get("codec", rec.codec)
+    rec.sample_rate = info.get("sample_rate", rec.sample_rate)
+    rec.channels = info.get("channels", rec.channels)
+    repo.save_recording(rec.session_id, rec)
+    repo.log_activity(rec.session_id, "recording_created", {
+        "recording_id": rec.id, "duration": rec.duration, "size": rec.size, "codec": rec.codec,
+        "language": rec.language, "text_length": rec.text_length,
+    })
+    return rec
+
+async def _upload(request: Request, repo: Repository, rec: Recording, offset: int, final: bool) -> Dict:
+    lock = _upload_locks.setdefault(rec.id, asyncio.Lock())
+    if lock.locked():
+        raise HTTPException(status_code=409, detail="Another upload to this recording is in progress")
+    async with lock:
+        try:
+            part = _part_file(repo, rec)
+            current = part.stat().st_size
+            if offset != current:
+                raise HTTPException(status_code=409, detail={"message": "Offset mismatch", "offset": current})
+            size = await _receive(request, rec, part, offset)
+            rec.size = size
+            if (rec.expected_size is not None and size >= rec.expected_size) or (rec.expected_size is None and final):
+                rec = await _finish(repo, rec)
+            else:
+                repo.save_recording(rec.session_id, rec)
+        finally:
+            _upload_locks.pop(rec.id, None)
+    return {**rec.to_dict(), "offset": rec.size}
+
+@router.get("/{session_id}/recordings")
+async def list_recordings(session_id: str, repo: Repository = Depends(get_repo)):
+    recordings = sorted(repo.load_recordings(session_id), key=lambda r: r.timestamp, reverse=True)
+    return {"recordings": [r.to_dict() for r in recordings]}
+
+@router.post("/{session_id}/recordings")
+async def create_recording(request: Request, session_id: str, filename: str = "recording.mp3",
+                           content_type: Optional[str] = None, size: Optional[int] = None,
+                           duration: Optional[float] = None, language: Optional[str] = None,
+                           text_length: Optional[int] = None, repo: Repository = Depends(get_repo)):
+    """Starts a recording upload; the body (possibly empty) is its first chunk.
+
+    Without `size` the body is the whole file. With `size`, send the rest
+    with PATCH .../recordings/{id}?offset=N; the upload completes when
+    `size` bytes have arrived.
+    """
+    if not (repo.sessions_dir / session_id).is_dir():
+        raise HTTPException(status_code=404, detail="Session not found")
+    if size is not None and not 0 < size <= RECORDINGS_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Recordings are limited to {RECORDINGS_MAX_BYTES} bytes")
+    recording_id = f"rec-{uuid.uuid4().hex[:12]}"
+    content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    extension = Path(filename).suffix.lower() or mimetypes.guess_extension(content_type) or ".bin"
+    rec = Recording(
+        id=recording_id,
+        session_id=session_id,
+        timestamp=datetime.now().isoformat(),
+        filename=f"{recording_id}{extension}",
+        content_type=content_type,
+        expected_size=size,
+        duration=duration,
+        language=language,
+        text_length=text_length,
+    )
+    recordings_dir = repo.recordings_dir(session_id)
+    recordings_dir.mkdir(parents=True, exist_ok=True)
+    _part_file(repo, rec).touch()
+    repo.save_recording(session_id, rec)
+    return await _upload(request, repo, rec, 0, final=size is None)
+
+@router.patch("/{session_id}/recordings/{recording_id}")
+async def append_recording(request: Request, session_id: str, recording_id: str, offset: int,
+                           final: bool = False, repo: Repository = Depends(get_repo)):
+    """Appends a chunk at offset. Pass final=true on the last chunk if no size was given."""
+    rec = _get_or_404(repo, session_id, recording_id)
+    if rec.status == "complete":
+        raise HTTPException(status_code=409, detail="Recording is already complete")
+    return await _upload(request, repo, rec, offset, final)
+
+@router.get("/{session_id}/recordings/{recording_id}/upload")
+async def upload_status(session_id: str, recording_id: str, repo: Repository = Depends(get_repo)):
+    """Where to resume an interrupted upload."""
+    rec = _get_or_404(repo, session_id, recording_id)
+    part = _part_file(repo, rec)
+    offset = part.stat().st_size if rec.status != "complete" and part.exists() else rec.size
+    return {"id": rec.id, "status": rec.status, "offset": offset, "expected_size": rec.expected_size}
+
+@router.api_route("/{session_id}/recordings/{recording_id}", methods=["GET", "HEAD"])
+async def download_recording(session_id: str, recording_id: str, repo: Repository = Depends(get_repo)):
+    """Serves the audio. Range requests (seeking, resumed downloads) get 206 partial responses;
+    full downloads go out zero-copy when the server supports the ASGI pathsend extension."""
+    rec = _get_or_404(repo, session_id, recording_id)
+    if rec.status != "complete":
+        raise HTTPException(status_code=409, detail="Recording upload is not complete")
+    return RecordingResponse(_file(repo, rec), media_type=rec.content_type, filename=rec.filename,
+                             content_disposition_type="inline")
+
+@router.delete("/{session_id}/recordings/{recording_id}")
+async def delete_recording(session_id: str, recording_id: str, repo: Repository = Depends(get_repo)):
+    rec = repo.delete_recording(session_id, recording_id)
+    if rec is None:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    _file(repo, rec).unlink(missing_ok=True)
+    _part_file(repo, rec).unlink(missing_ok=True)
+    return {"status": "removed"}
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from datetime import datetime
+import time
+from ..core.scheduler import Scheduler, SCHEDULER_MIN_INTERVAL
+from .deps import get_scheduler
+
+router = APIRouter(prefix="/v1/schedule", tags=["schedule"])
+
+class ScheduleRequest(BaseModel):
+    session_id: str
+    kind: str = "agent_turn"           # "agent_turn" or "tool"
+    message: Optional[str] = None      # For agent turns
+    model: Optional[str] = None
+    tool: Optional[str] = None         # For tool invocations
+    arguments: Dict[str, Any] = {}
+    run_at: Optional[str] = None       # ISO timestamp (local time)
+    delay_seconds: Optional[float] = None
+    interval_seconds: Optional[float] = None
+
+def parse_due_at(run_at: Optional[str], delay_seconds: Optional[float]) -> float:
+    if run_at:
+        try:
+            return datetime.fromisoformat(run_at).timestamp()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="run_at must be an ISO timestamp")
+    return time.time() + (delay_seconds or 0)
+
+def check_interval(interval_seconds: Optional[float]):
+    if interval_seconds is not None and not interval_seconds >= SCHEDULER_MIN_INTERVAL:
+        raise HTTPException(status_code=400,
+                            detail=f"interval_seconds must be at least {SCHEDULER_MIN_INTERVAL:g}")
+
+@router.get("")
+async def list_jobs(session_id: Optional[str] = None, limit: int = 100, scheduler: Scheduler = Depends(get_scheduler)):
+    jobs = scheduler.list_jobs(session_id, limit)
+    return {"jobs": [j.to_dict() for j in jobs], "pending": len(scheduler.jobs)}
+
+@router.post("")
+async def create_job(req: ScheduleRequest, scheduler: Scheduler = Depends(get_scheduler)):
+    if req.kind == "agent_turn":
+        if not req.message:
+            raise HTTPException(status_code=400, detail="message is required for agent turns")
+        payload = {"message": req.message, "model": req.model}
+    elif req.kind == "tool":
+        if not req.tool:
+            raise HTTPException(status_code=400, detail="tool is required for tool jobs")
+        payload = {"tool": req.tool, "arguments": req.arguments}
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind '{req.kind}'")
+
+    check_interval(req.interval_seconds)
+    due_at = parse_due_at(req.run_at, req.delay_seconds)
+    job = scheduler.schedule(req.session_id, due_at, req.kind, payload, interval=req.interval_seconds)
+    return {"job": job.to_dict()}
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str, scheduler: Scheduler = Depends(get_scheduler)):
+    if not scheduler.cancel(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"status": "cancelled", "job_id": job_id}
@@ -1,12 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from ..persistence.repository import Repository
+from .deps import get_repo
 import json
 import uuid
 from datetime import datetime
 
 router = APIRouter(prefix="/v1/sessions", tags=["secrets"])
-repo = Repository()
 
 class SecretRequest(BaseModel):
     name: str
@@ -14,7 +14,7 @@ class SecretRequest(BaseModel):
     value: str
 
 @router.get("/{session_id}/secrets")
-async def get_secrets(session_id: str):
+async def get_secrets(session_id: str, repo: Repository = Depends(get_repo)):
     secrets_file = repo.sessions_dir / session_id / "secrets.json"
     if not secrets_file.exists():
         return {"secrets": []}
@@ -22,7 +22,7 @@ async def get_secrets(session_id: str):
         return json.load(f)
 
 @router.post("/{session_id}/secrets")
-async def add_secret(session_id: str, req: SecretRequest):
+async def add_secret(session_id: str, req: SecretRequest, repo: Repository = Depends(get_repo)):
     secrets_file = repo.sessions_dir / session_id / "secrets.json"
     secrets_file.parent.mkdir(parents=True, exist_ok=True)
     
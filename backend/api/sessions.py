@@ -1,23 +1,23 @@
 from datetime import datetime
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List, Optional
 from ..persistence.repository import Repository
+from .deps import get_repo
 from ..persistence.models import SessionMetadata, Message
 
 router = APIRouter(prefix="/v1/sessions", tags=["sessions"])
-repo = Repository()
 
 @router.post("")
-async def create_session(folder_id: str = "default", title: str = None):
+async def create_session(folder_id: str = "default", title: str = None, repo: Repository = Depends(get_repo)):
     session_id = f"local-{int(datetime.now().timestamp() * 1000)}"
     return repo.create_session(session_id, folder_id, title)
 
 @router.get("", response_model=List[SessionMetadata])
-async def list_sessions(folder_id: Optional[str] = None):
+async def list_sessions(folder_id: Optional[str] = None, repo: Repository = Depends(get_repo)):
     return repo.list_sessions(folder_id)
 
 @router.get("/{session_id}")
-async def get_session(session_id: str):
+async def get_session(session_id: str, repo: Repository = Depends(get_repo)):
     metadata = repo.get_session(session_id)
     if not metadata:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -32,12 +32,12 @@ async def get_session(session_id: str):
     }
 
 @router.put("/{session_id}")
-async def update_session(session_id: str, title: str):
+async def update_session(session_id: str, title: str, repo: Repository = Depends(get_repo)):
     repo.update_session_title(session_id, title)
     return {"status": "updated"}
 
 @router.delete("/{session_id}")
-async def delete_session(session_id: str):
+async def delete_session(session_id: str, repo: Repository = Depends(get_repo)):
     # For now, just remove from folders
     repo.remove_session_from_folders(session_id)
     return {"status": "removed", "session_id": session_id}
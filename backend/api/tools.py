@@ -1,5 +1,8 @@
+import asyncio
 from fastapi import APIRouter
 from ..core.tools import registry
+from ..core.tool_cache import CachePolicy
+from ..core.file_index import file_index
 from ..services.voice import VoiceService
 from ..services.comms import CommsService
 
@@ -12,12 +15,26 @@ comms_service = CommsService()
 def generate_speech_tool(text: str, language: str = "en"):
     """Generates audio for the given text."""
     audio = voice_service.generate_speech(text, language)
-    return {"status": "success" if audio else "failed", "text": text}
+    if not audio:
+        # Raise so the failure isn't cached
+        raise RuntimeError("speech generation failed")
+    return {"status": "success", "text": text}
 
 def make_phone_call_tool(phone_number: str, text_to_say: str):
     """Initiates a phone call and speaks the provided text."""
     result = comms_service.initiate_call(phone_number)
-    return {"status": "initiated" if result else "failed", "call_sid": result.get("call_sid") if result else None}
+    if not result:
+        # Raise so a failed call can be retried instead of being de-duplicated
+        raise RuntimeError("call initiation failed")
+    return {"status": "initiated", "call_sid": result.get("call_sid")}
+
+async def search_files_tool(query: str, limit: int = 5):
+    """Full-text search over the indexed local folders."""
+    return {"results": await asyncio.to_thread(file_index.search, query, limit)}
+
+async def read_file_tool(path: str, offset: int = 0, max_chars: int = 8000):
+    """Reads part of a file inside the indexed local folders."""
+    return await asyncio.to_thread(file_index.read, path, offset, max_chars)
 
 # --- Register Tools ---
 
@@ -32,7 +49,9 @@ registry.register(
         },
         "required": ["text"]
     },
-    func=generate_speech_tool
+    func=generate_speech_tool,
+    keywords=["speak", "say", "voice", "audio", "aloud", "read", "pronounce", "صوت", "انطق", "اقرأ"],
+    cache=CachePolicy(mode="pure", ttl=600)
 )
 
 registry.register(
@@ -46,7 +65,41 @@ registry.register(
         },
         "required": ["phone_number", "text_to_say"]
     },
-    func=make_phone_call_tool
+    func=make_phone_call_tool,
+    keywords=["phone", "dial", "ring", "contact", "اتصل", "مكالمة", "هاتف"],
+    # Never place the same call twice because the model repeated itself within a turn
+    cache=CachePolicy(mode="idempotent", key_fields=["phone_number", "text_to_say"])
+)
+
+registry.register(
+    name="search_files",
+    description="Search the content of the user's local files and return the best matching passages with their paths.",
+    parameters={
+        "type": "object",
+        "properties": {
+            "query": {"type": "string", "description": "Words to search for."},
+            "limit": {"type": "integer", "description": "Maximum number of passages to return."}
+        },
+        "required": ["query"]
+    },
+    func=search_files_tool,
+    keywords=["find", "look", "document", "note", "folder", "grep", "where", "ابحث", "ملف", "مستند"]
+)
+
+registry.register(
+    name="read_file",
+    description="Read the text content of a local file. Use offset to continue reading long files.",
+    parameters={
+        "type": "object",
+        "properties": {
+            "path": {"type": "string", "description": "Absolute path of the file."},
+            "offset": {"type": "integer", "description": "Character offset to start reading from."},
+            "max_chars": {"type": "integer", "description": "Maximum number of characters to return."}
+        },
+        "required": ["path"]
+    },
+    func=read_file_tool,
+    keywords=["open", "show", "content", "document", "text", "اقرأ", "افتح", "ملف"]
 )
 
 @router.get("")
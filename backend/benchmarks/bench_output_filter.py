@@ -0,0 +1,74 @@
+"""Per-chunk cost of the FORBIDDEN_WORDS stream filter.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_output_filter [--words 500] [--chars 200000]
+"""
+import argparse
+import random
+import re
+import time
+
+from ..core.output_filter import StreamFilter, compile_words
+
+
+def _make_words(count: int):
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    arabic = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+    words = set()
+    while len(words) < count:
+        alphabet = arabic if len(words) % 4 == 0 else letters
+        words.add("".join(rng.choice(alphabet) for _ in range(rng.randint(3, 9))))
+    return tuple(sorted(words))
+
+
+def _make_text(words, chars: int) -> str:
+    rng = random.Random(11)
+    filler = "the quick brown fox jumps over the lazy dog and then naps in the sun".split()
+    parts, size = [], 0
+    while size < chars:
+        word = rng.choice(words) if rng.random() < 0.02 else rng.choice(filler)
+        parts.append(word.upper() if rng.random() < 0.1 else word)
+        size += len(word) + 1
+    return " ".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--chars", type=int, default=200_000)
+    parser.add_argument("--chunk", type=int, default=4, help="characters per streamed chunk (about one token)")
+    args = parser.parse_args()
+
+    words = _make_words(args.words)
+    text = _make_text(words, args.chars)
+
+    start = time.perf_counter()
+    automaton = compile_words(words)
+    compile_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    compile_words(words)
+    cached_us = (time.perf_counter() - start) * 1e6
+
+    stream = StreamFilter(automaton)
+    chunks = [text[i:i + args.chunk] for i in range(0, len(text), args.chunk)]
+    start = time.perf_counter()
+    out = "".join(stream.feed(c) for c in chunks) + stream.flush()
+    stream_s = time.perf_counter() - start
+    assert len(out) == len(text)
+
+    # Baseline: one case-insensitive regex alternation per reply, which cannot stream
+    pattern = re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE)
+    start = time.perf_counter()
+    pattern.sub(lambda m: "*" * len(m.group()), text)
+    regex_s = time.perf_counter() - start
+
+    print(f"{len(words)} words, {len(text):,} chars in {len(chunks):,} chunks of {args.chunk}")
+    print(f"  compile:          {compile_ms:8.2f} ms  (cached: {cached_us:.1f} us)")
+    print(f"  stream filter:    {stream_s * 1e6 / len(chunks):8.2f} us/chunk  "
+          f"({len(text) / stream_s / 1e6:.2f} M chars/s, {len(stream.matches)} matches)")
+    print(f"  regex, whole text:{regex_s * 1000:8.2f} ms total")
+
+
+if __name__ == "__main__":
+    main()
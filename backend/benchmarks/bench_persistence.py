@@ -0,0 +1,85 @@
+"""Encode/decode throughput of the persistence codecs on a large session.
+
+Run from the repository root:
+    python -m backend.benchmarks.bench_persistence [--messages 100000]
+"""
+import argparse
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from ..persistence.codec import get_codec, _BACKENDS
+from ..persistence.models import Message
+
+
+@dataclass
+class LegacyMessage:
+    """The pre-codec model: a plain dataclass without slots."""
+    id: str
+    role: str
+    text: str
+    timestamp: str
+    model: Optional[str] = None
+
+
+def _make_messages(cls, count: int):
+    return [
+        cls(
+            id=f"msg-{i:08d}",
+            role="user" if i % 2 == 0 else "assistant",
+            text=f"Message {i}: the quick brown fox jumps over the lazy dog. " * 3,
+            timestamp="2026-01-01T12:00:00.000000",
+            model="llama3.2",
+        )
+        for i in range(count)
+    ]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_legacy(count: int):
+    messages = _make_messages(LegacyMessage, count)
+    enc_t, blob = _timed(lambda: "".join(json.dumps(asdict(m)) + "\n" for m in messages).encode())
+    dec_t, _ = _timed(lambda: [LegacyMessage(**json.loads(line)) for line in blob.decode().splitlines() if line.strip()])
+    return enc_t, dec_t, len(blob)
+
+
+def bench_codec(name: str, count: int):
+    codec = get_codec(name)
+    messages = _make_messages(Message, count)
+    enc_t, blob = _timed(lambda: b"".join(codec.encode(m) + b"\n" for m in messages))
+    dec_t, decoded = _timed(lambda: codec.decode_lines(blob, Message))
+    assert len(decoded) == count
+    return enc_t, dec_t, len(blob)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+    count = args.messages
+
+    rows = [("legacy (asdict + json)",) + bench_legacy(count)]
+    for name in _BACKENDS:
+        try:
+            rows.append((name,) + bench_codec(name, count))
+        except ImportError:
+            print(f"skipping {name}: not installed")
+
+    base_enc, base_dec = rows[0][1], rows[0][2]
+    print(f"{count:,} messages")
+    print(f"{'backend':<24}{'encode/s':>14}{'decode/s':>14}{'enc x':>8}{'dec x':>8}{'MB':>8}")
+    for name, enc_t, dec_t, size in rows:
+        print(
+            f"{name:<24}{count / enc_t:>14,.0f}{count / dec_t:>14,.0f}"
+            f"{base_enc / enc_t:>8.1f}{base_dec / dec_t:>8.1f}{size / 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
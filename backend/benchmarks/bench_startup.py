@@ -0,0 +1,81 @@
+"""Cold-start time and import-time profile of the API and agent entry points.
+
+Every measurement runs in a fresh interpreter so nothing is cached in
+sys.modules. Run from the repository root:
+    python -m backend.benchmarks.bench_startup [--runs 5] [--top 15]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Entry points whose import cost we track: the API app and the agent core
+# used by scripts that drive LocalAgent directly.
+TARGETS = ["backend.main", "backend.core.agent", "backend.persistence.repository"]
+
+STARTUP_SNIPPET = """
+import asyncio, time
+t0 = time.perf_counter()
+from backend.main import app
+t1 = time.perf_counter()
+async def run():
+    async with app.router.lifespan_context(app):
+        pass
+asyncio.run(run())
+t2 = time.perf_counter()
+print(f"{t1 - t0:.6f} {t2 - t1:.6f}")
+"""
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def import_profile(module: str, top: int):
+    """Parses `python -X importtime` output into (cumulative_us, module) rows."""
+    stderr = _python("-X", "importtime", "-c", f"import {module}").stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Drop the separator space; each further 2-space indent is one nesting level
+        name = name.rstrip()[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    total = sum(r[0] for r in rows if r[2] == 0)
+    # Direct imports of the target, so nested imports don't crowd the report
+    direct = sorted((r for r in rows if r[2] == 1), reverse=True)
+    return total, [(c, s, n) for c, s, _, n in direct[:top]]
+
+
+def cold_start(runs: int):
+    imports, lifespans = [], []
+    for _ in range(runs):
+        out = _python("-c", STARTUP_SNIPPET).stdout.split()
+        imports.append(float(out[0]))
+        lifespans.append(float(out[1]))
+    return imports, lifespans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in TARGETS:
+        total, rows = import_profile(module, args.top)
+        print(f"\nimport {module}: {total / 1000:.1f} ms")
+        print(f"  {'cumulative ms':>14}{'self ms':>10}  module")
+        for cumulative_us, self_us, name in rows:
+            print(f"  {cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+    imports, lifespans = cold_start(args.runs)
+    print(f"\nAPI cold start over {args.runs} runs (median / max)")
+    print(f"  import backend.main  {statistics.median(imports) * 1000:8.1f} / {max(imports) * 1000:8.1f} ms")
+    print(f"  lifespan startup     {statistics.median(lifespans) * 1000:8.1f} / {max(lifespans) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
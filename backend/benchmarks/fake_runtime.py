@@ -0,0 +1,196 @@
+"""OpenAI-compatible fake model runtime for load tests.
+
+Answers /v1/chat/completions (plain and streamed) after a configurable
+time to first token and token rate, and asks for a tool call at a
+configurable rate, so the API can be loaded without a model. It is a
+small stdlib HTTP/1.1 server with keep-alive, cheap enough that it does
+not skew what it measures. Run from the repository root:
+    python -m backend.benchmarks.fake_runtime [--port 8011] [--ttft-ms 200] [--tokens-per-sec 50]
+and point AI_RUNTIME_BASE_URL at http://127.0.0.1:8011/v1.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+WORDS = ("local", "agent", "runs", "on", "your", "machine", "and", "answers", "quickly", "with", "care")
+
+
+@dataclass
+class RuntimeConfig:
+    ttft_ms: float = 200.0             # Delay before the first token
+    tokens_per_sec: float = 50.0       # Generation speed after the first token
+    reply_tokens: int = 60             # Tokens per reply
+    tool_call_rate: float = 0.2        # Chance a turn offered tools asks for one
+    # Only these tools are ever called: others can place calls or send audio
+    tools: Tuple[str, ...] = ("search_files",)
+    seed: Optional[int] = None
+
+
+def _fake_arguments(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Placeholder values for a tool's required parameters."""
+    values = {"string": "load test", "integer": 1, "number": 1, "boolean": False, "array": [], "object": {}}
+    props = parameters.get("properties", {})
+    return {name: values.get(props.get(name, {}).get("type"), "load test") for name in parameters.get("required", [])}
+
+
+class FakeRuntime:
+    def __init__(self, config: RuntimeConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats = {"requests": 0, "tool_calls": 0, "streamed": 0}
+
+    # --- Completions ---
+
+    def _pick_tool(self, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        messages = body.get("messages") or []
+        if not body.get("tools") or (messages and messages[-1].get("role") == "tool"):
+            return None
+        allowed = [t["function"] for t in body["tools"] if t.get("function", {}).get("name") in self.config.tools]
+        if not allowed or self.rng.random() >= self.config.tool_call_rate:
+            return None
+        return self.rng.choice(allowed)
+
+    def _reply_text(self) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.config.reply_tokens))
+
+    def _generation_seconds(self, tokens: int) -> float:
+        return self.config.ttft_ms / 1000 + tokens / max(self.config.tokens_per_sec, 1e-6)
+
+    async def complete(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self.stats["requests"] += 1
+        tool = self._pick_tool(body)
+        if tool:
+            self.stats["tool_calls"] += 1
+            await asyncio.sleep(self._generation_seconds(10))
+            message = {"role": "assistant", "content": None, "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": tool["name"], "arguments": json.dumps(_fake_arguments(tool.get("parameters", {})))},
+            }]}
+            finish, tokens = "tool_calls", 10
+        else:
+            await asyncio.sleep(self._generation_seconds(self.config.reply_tokens))
+            message = {"role": "assistant", "content": self._reply_text()}
+            finish, tokens = "stop", self.config.reply_tokens
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": tokens, "total_tokens": tokens},
+        }
+
+    async def stream(self, body: Dict[str, Any], writer: asyncio.StreamWriter):
+        self.stats["requests"] += 1
+        self.stats["streamed"] += 1
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+        await asyncio.sleep(self.config.ttft_ms / 1000)
+        interval = 1 / max(self.config.tokens_per_sec, 1e-6)
+        for i in range(self.config.reply_tokens):
+            delta = {"content": self.rng.choice(WORDS) + " "}
+            chunk = {"id": completion_id, "object": "chat.completion.chunk", "model": body.get("model", "fake"),
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            self._write_chunk(writer, f"data: {json.dumps(chunk)}\n\n".encode())
+            await writer.drain()
+            if i + 1 < self.config.reply_tokens:
+                await asyncio.sleep(interval)
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    # --- HTTP ---
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = json.loads(await reader.readexactly(length)) if length else {}
+
+                if method == "POST" and path.endswith("/chat/completions"):
+                    if body.get("stream"):
+                        await self.stream(body, writer)
+                        continue
+                    await self._respond(writer, 200, await self.complete(body))
+                elif method == "GET" and path.endswith("/models"):
+                    await self._respond(writer, 200, {"object": "list", "data": [{"id": "fake", "object": "model"}]})
+                else:
+                    await self._respond(writer, 404, {"error": {"message": f"No route {method} {path}"}})
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode()
+        reason = "OK" if status == 200 else "Not Found"
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8011) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port, backlog=1024)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    defaults = RuntimeConfig()
+    parser.add_argument("--ttft-ms", type=float, default=defaults.ttft_ms, help="time to first token")
+    parser.add_argument("--tokens-per-sec", type=float, default=defaults.tokens_per_sec)
+    parser.add_argument("--reply-tokens", type=int, default=defaults.reply_tokens)
+    parser.add_argument("--tool-call-rate", type=float, default=defaults.tool_call_rate)
+    parser.add_argument("--tools", default=",".join(defaults.tools), help="tools the fake may call (comma-separated)")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> RuntimeConfig:
+    return RuntimeConfig(ttft_ms=args.ttft_ms, tokens_per_sec=args.tokens_per_sec, reply_tokens=args.reply_tokens,
+                         tool_call_rate=args.tool_call_rate, tools=tuple(t for t in args.tools.split(",") if t),
+                         seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    add_arguments(parser)
+    args = parser.parse_args()
+    runtime = FakeRuntime(config_from_args(args))
+
+    async def run():
+        server = await runtime.serve(args.host, args.port)
+        print(f"Fake runtime on http://{args.host}:{args.port}/v1", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(f"Served {runtime.stats}")
+
+
+if __name__ == "__main__":
+    main()
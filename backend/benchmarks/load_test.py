@@ -0,0 +1,282 @@
+"""Concurrent-user load test of the API against the fake model runtime.
+
+Simulated users each open a session, then mix chat turns (with tool calls
+decided by the fake runtime), dashboard polls, memory writes and session
+reads until the run ends. The report gives p50/p95/p99 latency,
+throughput and error rate per endpoint.
+
+By default the real app (backend.main:app) runs in-process on a temporary
+data directory, and the fake runtime runs in a subprocess so it does not
+share the app's CPU. Run from the repository root:
+    python -m backend.benchmarks.load_test [--users 50] [--duration 30] [--ttft-ms 200]
+    python -m backend.benchmarks.load_test --url http://localhost:8000   # a running server
+    python -m backend.benchmarks.load_test --save baseline.json
+    python -m backend.benchmarks.load_test --baseline baseline.json      # exits 1 on regression
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .fake_runtime import add_arguments
+
+MESSAGES = [
+    "What's on my schedule today?",
+    "Find my notes about the budget",
+    "Summarize what we discussed",
+    "Search my files for the contract draft",
+    "Give me three ideas for the weekend",
+]
+FACTS = [
+    "User prefers dark mode",
+    "User's favourite editor is vim",
+    "User works on project {n}",
+    "The user prefers dark mode.",
+    "User lives in time zone UTC+{n}",
+]
+DEFAULT_MIX = "chat=5,dashboard=2,memory=1,session=2"
+
+
+class Recorder:
+    """Latencies and errors per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_samples: Dict[str, str] = {}
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None):
+        self.latencies[endpoint].append(seconds * 1000)
+        if error:
+            self.errors[endpoint] += 1
+            self.error_samples.setdefault(endpoint, error)
+
+
+async def _call(client: httpx.AsyncClient, recorder: Recorder, endpoint: str, method: str, url: str, **kwargs):
+    start = time.perf_counter()
+    error = None
+    response = None
+    try:
+        response = await client.request(method, url, **kwargs)
+        if response.status_code >= 400:
+            error = f"HTTP {response.status_code}: {response.text[:120]}"
+        elif endpoint == "POST /v1/chat" and response.json().get("reply", "").startswith("Error:"):
+            # The chat endpoint reports runtime and tool failures in the reply
+            error = response.json()["reply"][:120]
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    recorder.record(endpoint, time.perf_counter() - start, error)
+    return response
+
+
+async def _user(client: httpx.AsyncClient, recorder: Recorder, rng: random.Random, mix: Dict[str, float],
+                deadline: float, think_ms: float):
+    response = await _call(client, recorder, "POST /v1/sessions", "POST", "/v1/sessions",
+                           params={"title": "load test"})
+    if response is None or response.status_code >= 400:
+        return
+    session_id = response.json()["session_id"]
+    actions, weights = list(mix), list(mix.values())
+    while time.monotonic() < deadline:
+        action = rng.choices(actions, weights)[0]
+        if action == "chat":
+            await _call(client, recorder, "POST /v1/chat", "POST", "/v1/chat",
+                        json={"session_id": session_id, "message": rng.choice(MESSAGES)})
+        elif action == "dashboard":
+            await _call(client, recorder, "GET /v1/dashboard/stats", "GET", "/v1/dashboard/stats")
+        elif action == "memory":
+            fact = rng.choice(FACTS).format(n=rng.randint(1, 50))
+            await _call(client, recorder, "POST /v1/memory", "POST", "/v1/memory",
+                        params={"fact": fact, "source_session": session_id})
+        elif action == "session":
+            await _call(client, recorder, "GET /v1/sessions/{id}", "GET", f"/v1/sessions/{session_id}")
+        if think_ms:
+            await asyncio.sleep(rng.expovariate(1000 / think_ms))
+
+
+def _percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(0, math.ceil(p / 100 * len(values)) - 1)]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for endpoint in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[endpoint])
+        report[endpoint] = {
+            "requests": len(values),
+            "errors": recorder.errors[endpoint],
+            "error_rate": recorder.errors[endpoint] / len(values),
+            "rps": len(values) / elapsed,
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "p99_ms": _percentile(values, 99),
+            "max_ms": values[-1],
+        }
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, float]], recorder: Recorder, elapsed: float, users: int):
+    print(f"\n{users} users for {elapsed:.1f}s")
+    print(f"{'endpoint':<26}{'reqs':>7}{'rps':>8}{'err%':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, r in report.items():
+        print(f"{endpoint:<26}{r['requests']:>7}{r['rps']:>8.1f}{r['error_rate'] * 100:>7.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+    total = sum(r["requests"] for r in report.values())
+    errors = sum(r["errors"] for r in report.values())
+    print(f"{'total':<26}{total:>7}{total / elapsed:>8.1f}{(errors / total if total else 0) * 100:>7.1f}")
+    for endpoint, sample in recorder.error_samples.items():
+        print(f"  first error on {endpoint}: {sample}")
+
+
+def compare(report: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Endpoints whose p95, throughput or error rate got worse than the baseline allows."""
+    regressions = []
+    for endpoint, base in baseline.items():
+        current = report.get(endpoint)
+        if current is None:
+            regressions.append(f"{endpoint}: no requests (baseline had {base['requests']})")
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{endpoint}: p95 {current['p95_ms']:.1f} ms vs {base['p95_ms']:.1f} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{endpoint}: {current['rps']:.1f} rps vs {base['rps']:.1f} rps")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{endpoint}: error rate {current['error_rate']:.1%} vs {base['error_rate']:.1%}")
+    return regressions
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@asynccontextmanager
+async def fake_runtime(args: argparse.Namespace):
+    """Starts the fake runtime in a subprocess and yields its base URL."""
+    port = _free_port()
+    cmd = [sys.executable, "-m", "backend.benchmarks.fake_runtime", "--port", str(port),
+           "--ttft-ms", str(args.ttft_ms), "--tokens-per-sec", str(args.tokens_per_sec),
+           "--reply-tokens", str(args.reply_tokens), "--tool-call-rate", str(args.tool_call_rate),
+           "--tools", args.tools]
+    if args.seed is not None:
+        cmd += ["--seed", str(args.seed)]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    try:
+        process.stdout.readline()  # Printed once the server is listening
+        yield f"http://127.0.0.1:{port}/v1"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@asynccontextmanager
+async def target(args: argparse.Namespace, runtime_url: str):
+    """An HTTP client for the app under test: a running server, or the app in-process."""
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    timeout = httpx.Timeout(args.timeout)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=timeout) as client:
+            yield client
+        return
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="localagent-load-")
+    # Must be set before backend.main is imported: they are read at import and startup
+    os.environ["LOCALAGENT_DATA_DIR"] = data_dir
+    os.environ["AI_RUNTIME_BASE_URL"] = runtime_url
+    os.environ.setdefault("MODEL_API_KEY", "fake")
+    from ..main import app
+    print(f"App in-process, data in {data_dir}")
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://app", limits=limits, timeout=timeout) as client:
+            yield client
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ("chat", "dashboard", "memory", "session"):
+            raise SystemExit(f"Unknown action '{name}' in --mix")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    recorder = Recorder()
+
+    @asynccontextmanager
+    async def runtime():
+        if args.runtime_url or args.url:
+            yield args.runtime_url
+        else:
+            async with fake_runtime(args) as url:
+                yield url
+
+    async with runtime() as runtime_url:
+        async with target(args, runtime_url) as client:
+            rng = random.Random(args.seed)
+            start = time.monotonic()
+            deadline = start + args.duration
+            users = []
+            for i in range(args.users):
+                users.append(asyncio.create_task(
+                    _user(client, recorder, random.Random(rng.random()), mix, deadline, args.think_ms)))
+                # Spread user arrivals over the ramp-up period
+                if args.ramp:
+                    await asyncio.sleep(args.ramp / args.users)
+            await asyncio.gather(*users)
+            elapsed = time.monotonic() - start
+
+    report = summarize(recorder, elapsed)
+    print_report(report, recorder, elapsed, args.users)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50, help="concurrent simulated users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--ramp", type=float, default=5, help="seconds over which users arrive")
+    parser.add_argument("--think-ms", type=float, default=500, help="mean pause between a user's requests")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="action weights, e.g. chat=5,dashboard=2,memory=1,session=2")
+    parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds")
+    parser.add_argument("--url", help="load a running server instead of the in-process app")
+    parser.add_argument("--runtime-url", help="use this model runtime instead of starting the fake one")
+    parser.add_argument("--data-dir", help="data directory for the in-process app (default: a temp dir)")
+    parser.add_argument("--save", help="write the report as JSON")
+    parser.add_argument("--baseline", help="compare with a saved report; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/throughput change vs baseline")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
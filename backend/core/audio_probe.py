@@ -0,0 +1,116 @@
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Header-only metadata for the formats recordings usually arrive in (WAV, MP3,
+# Ogg Opus/Vorbis). Only the first and last few KB are read, so probing a
+# multi-hundred-MB call recording is as cheap as probing a short clip.
+
+HEAD_BYTES = 64 * 1024
+TAIL_BYTES = 64 * 1024
+
+_MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],   # MPEG-1 Layer III
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],       # MPEG-2/2.5 Layer III
+}
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+_WAV_CODECS = {1: "pcm", 3: "pcm_float", 6: "alaw", 7: "mulaw", 0xFFFE: "pcm"}
+
+def probe(path: Path) -> Dict[str, Any]:
+    """Returns whatever of codec, duration (seconds), sample_rate and channels can be read."""
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(HEAD_BYTES)
+            if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+                return _probe_wav(head, size)
+            if head[:4] == b"OggS":
+                f.seek(max(0, size - TAIL_BYTES))
+                return _probe_ogg(head, f.read(TAIL_BYTES))
+            if head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0):
+                return _probe_mp3(head, size)
+    except (OSError, struct.error, ValueError, IndexError, ZeroDivisionError) as e:
+        print(f"Could not probe {path}: {e}")
+    return {}
+
+def _probe_wav(head: bytes, size: int) -> Dict[str, Any]:
+    info: Dict[str, Any] = {}
+    pos = 12
+    while pos + 8 <= len(head):
+        chunk_id, chunk_size = head[pos:pos + 4], struct.unpack_from("<I", head, pos + 4)[0]
+        if chunk_id == b"fmt " and pos + 24 <= len(head):
+            fmt, channels, rate, byte_rate, _, bits = struct.unpack_from("<HHIIHH", head, pos + 8)
+            codec = _WAV_CODECS.get(fmt, f"wav_0x{fmt:04x}")
+            info.update(codec=f"{codec}_{bits}" if codec.startswith("pcm") else codec,
+                        sample_rate=rate, channels=channels, byte_rate=byte_rate)
+        elif chunk_id == b"data":
+            # Streaming writers leave the size at 0 or 0xFFFFFFFF; fall back to the file size
+            data_size = chunk_size if 0 < chunk_size < 0xFFFFFFFF else size - pos - 8
+            if info.get("byte_rate"):
+                info["duration"] = round(min(data_size, size - pos - 8) / info["byte_rate"], 3)
+            break
+        pos += 8 + chunk_size + (chunk_size & 1)
+    info.pop("byte_rate", None)
+    return info
+
+def _probe_mp3(head: bytes, size: int) -> Dict[str, Any]:
+    start = 0
+    if head[:3] == b"ID3":
+        if len(head) < 10:
+            return {"codec": "mp3"}
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        if start + 4 > len(head):
+            return {"codec": "mp3"}
+    pos = head.find(b"\xff", start)
+    while 0 <= pos < len(head) - 4 and head[pos + 1] & 0xE0 != 0xE0:
+        pos = head.find(b"\xff", pos + 1)
+    if pos < 0 or pos >= len(head) - 4:
+        return {"codec": "mp3"}
+    b1, b2, b3 = head[pos + 1], head[pos + 2], head[pos + 3]
+    version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+    if layer != 1 or version == 1:
+        return {"codec": "mpeg_audio"}
+    rate = _MP3_SAMPLE_RATES[version][(b2 >> 2) & 3] if (b2 >> 2) & 3 < 3 else 0
+    bitrate = _MP3_BITRATES[1 if version == 3 else 2][b2 >> 4] if b2 >> 4 < 15 else 0
+    mono = b3 >> 6 == 3
+    info: Dict[str, Any] = {"codec": "mp3", "sample_rate": rate, "channels": 1 if mono else 2}
+    samples_per_frame = 1152 if version == 3 else 576
+
+    # VBR files carry the frame count in a Xing/Info or VBRI header in the first frame
+    side_info = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+    xing = pos + 4 + side_info
+    frames: Optional[int] = None
+    if head[xing:xing + 4] in (b"Xing", b"Info") and struct.unpack_from(">I", head, xing + 4)[0] & 1:
+        frames = struct.unpack_from(">I", head, xing + 8)[0]
+    elif head[pos + 36:pos + 40] == b"VBRI":
+        frames = struct.unpack_from(">I", head, pos + 50)[0]
+    if frames and rate:
+        info["duration"] = round(frames * samples_per_frame / rate, 3)
+    elif bitrate:
+        info["duration"] = round((size - pos) * 8 / (bitrate * 1000), 3)
+    return info
+
+def _probe_ogg(head: bytes, tail: bytes) -> Dict[str, Any]:
+    # The first packet starts after the 27-byte page header and its segment table
+    if len(head) < 27:
+        return {"codec": "ogg"}
+    body = 27 + head[26]
+    info: Dict[str, Any] = {}
+    if head[body:body + 8] == b"OpusHead" and len(head) >= body + 12:
+        info = {"codec": "opus", "channels": head[body + 9], "sample_rate": 48000}
+        pre_skip, rate = struct.unpack_from("<H", head, body + 10)[0], 48000
+    elif head[body:body + 7] == b"\x01vorbis" and len(head) >= body + 16:
+        channels, rate = struct.unpack_from("<BI", head, body + 11)
+        info = {"codec": "vorbis", "channels": channels, "sample_rate": rate}
+        pre_skip = 0
+    else:
+        return {"codec": "ogg"}
+    # Duration is the granule position of the last page
+    last = tail.rfind(b"OggS")
+    if last >= 0 and last + 14 <= len(tail) and rate:
+        granule = struct.unpack_from("<q", tail, last + 6)[0]
+        if granule > 0:
+            info["duration"] = round((granule - pre_skip) / rate, 3)
+    return info
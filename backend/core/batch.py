@@ -0,0 +1,261 @@
+import os
+import time
+import shutil
+import uuid
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, AsyncIterator, Set, Tuple
+from ..persistence.repository import Repository
+from ..persistence.codec import codec
+
+# Concurrent turns per model runtime endpoint, shared by all batch jobs.
+# Match it to what the runtime serves in parallel (e.g. OLLAMA_NUM_PARALLEL).
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+# Progress is checkpointed to state.json every this many items
+CHECKPOINT_EVERY = 50
+
+class BatchRunner:
+    """Runs JSONL batches of chat turns through LocalAgent.
+
+    Each job lives in data/batches/<job_id>/ as input.jsonl, output.jsonl
+    and state.json. Results are appended to output.jsonl as they finish, so
+    the output file doubles as the checkpoint: resuming a job skips every
+    item index already written there. Items for the same session run in
+    input order; different sessions run concurrently, bounded per runtime
+    endpoint.
+    """
+
+    def __init__(self, repository: Repository, agent, concurrency: int = BATCH_CONCURRENCY):
+        self.repo = repository
+        self.agent = agent
+        self.batches_dir = repository.data_dir / "batches"
+        self.concurrency = concurrency
+        self._endpoint_slots: Dict[str, asyncio.Semaphore] = {}
+        self._session_locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._progress: Dict[str, asyncio.Condition] = {}
+
+    # --- Job Files ---
+
+    def _job_dir(self, job_id: str) -> Path:
+        return self.batches_dir / job_id
+
+    def _save_state(self, state: Dict[str, Any]):
+        state_file = self._job_dir(state["id"]) / "state.json"
+        tmp_file = state_file.with_suffix(".tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(codec.encode(state, pretty=True))
+        tmp_file.replace(state_file)
+
+    def get_state(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if job_id in self._states:
+            return self._states[job_id]
+        state_file = self._job_dir(job_id) / "state.json"
+        if not state_file.exists():
+            return None
+        with open(state_file, "rb") as f:
+            return codec.decode(f.read())
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        if not self.batches_dir.exists():
+            return []
+        jobs = [self.get_state(d.name) for d in self.batches_dir.iterdir() if d.is_dir()]
+        return sorted((j for j in jobs if j), key=lambda j: j["created_at"], reverse=True)
+
+    def output_file(self, job_id: str) -> Path:
+        return self._job_dir(job_id) / "output.jsonl"
+
+    async def create_job(self, lines: AsyncIterator[bytes], concurrency: Optional[int] = None,
+                         model: Optional[str] = None) -> Dict[str, Any]:
+        """Streams the uploaded JSONL to disk, counting items, and starts the job.
+
+        Raises ValueError for a concurrency below 1 or an empty batch; nothing
+        is kept on disk in that case.
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        job_id = f"batch-{uuid.uuid4().hex[:12]}"
+        job_dir = self._job_dir(job_id)
+        job_dir.mkdir(parents=True, exist_ok=True)
+        total = 0
+        buffer = b""
+        with open(job_dir / "input.jsonl", "wb") as f:
+            async for chunk in lines:
+                buffer += chunk
+                *complete, buffer = buffer.split(b"\n")
+                for line in complete:
+                    if line.strip():
+                        f.write(line + b"\n")
+                        total += 1
+            if buffer.strip():
+                f.write(buffer + b"\n")
+                total += 1
+        if total == 0:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise ValueError("Batch is empty")
+        state = {
+            "id": job_id,
+            "status": "queued",
+            "created_at": datetime.now().isoformat(),
+            "total": total,
+            "completed": 0,
+            "failed": 0,
+            "concurrency": concurrency or self.concurrency,
+            "model": model,
+        }
+        self._save_state(state)
+        self.start(job_id)
+        return state
+
+    # --- Execution ---
+
+    def start(self, job_id: str) -> bool:
+        if job_id in self._tasks and not self._tasks[job_id].done():
+            return False
+        state = self.get_state(job_id)
+        if state is None or state["status"] == "completed":
+            return False
+        self._states[job_id] = state
+        self._progress.setdefault(job_id, asyncio.Condition())
+        self._tasks[job_id] = asyncio.create_task(self._run(job_id))
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            return False
+        self._states[job_id]["status"] = "cancelled"
+        task.cancel()
+        return True
+
+    def resume_interrupted(self) -> List[str]:
+        """Restarts jobs that were queued or running when the app stopped."""
+        resumed = []
+        for state in self.list_jobs():
+            if state["status"] in ("queued", "running") and self.start(state["id"]):
+                resumed.append(state["id"])
+        return resumed
+
+    async def stop(self):
+        tasks = [t for t in self._tasks.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _read_checkpoint(self, job_id: str) -> Tuple[Set[int], int]:
+        """Returns the item indices already in output.jsonl and how many of them failed."""
+        output_file = self.output_file(job_id)
+        if not output_file.exists():
+            return set(), 0
+        with open(output_file, "rb") as f:
+            data = f.read()
+        # A crash can leave a partial last line; drop it so the item reruns
+        if data and not data.endswith(b"\n"):
+            data = data[:data.rfind(b"\n") + 1]
+            with open(output_file, "wb") as f:
+                f.write(data)
+        records = codec.decode_lines(data)
+        return {r["index"] for r in records}, sum(1 for r in records if r.get("error"))
+
+    def _endpoint_slot(self) -> asyncio.Semaphore:
+        endpoint = self.agent.ai_runtime_base_url
+        if endpoint not in self._endpoint_slots:
+            self._endpoint_slots[endpoint] = asyncio.Semaphore(self.concurrency)
+        return self._endpoint_slots[endpoint]
+
+    async def _run(self, job_id: str):
+        state = self._states[job_id]
+        done, failed = self._read_checkpoint(job_id)
+        state["status"] = "running"
+        state["completed"] = len(done)
+        state["failed"] = failed
+        self._save_state(state)
+
+        # Jobs saved with a concurrency of 0 would never finish and resume on every start
+        concurrency = max(1, state["concurrency"] or self.concurrency)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        output = open(self.output_file(job_id), "ab")
+        started = time.monotonic()
+        processed = 0
+
+        async def worker():
+            while True:
+                index, line = await queue.get()
+                nonlocal processed
+                try:
+                    record = await self._run_item(index, line, state.get("model"))
+                    output.write(codec.encode(record) + b"\n")
+                    output.flush()
+                    state["completed"] += 1
+                    if record.get("error"):
+                        state["failed"] += 1
+                    processed += 1
+                    state["items_per_second"] = round(processed / (time.monotonic() - started), 2)
+                    if state["completed"] % CHECKPOINT_EVERY == 0:
+                        self._save_state(state)
+                    await self._notify(job_id)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            with open(self._job_dir(job_id) / "input.jsonl", "rb") as f:
+                for index, line in enumerate(f):
+                    if index not in done:
+                        await queue.put((index, line))
+            await queue.join()
+            state["status"] = "completed"
+            state["finished_at"] = datetime.now().isoformat()
+        finally:
+            # On shutdown the status stays "running" so the job resumes on next start
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            output.close()
+            self._save_state(state)
+            self._states.pop(job_id, None)
+            await self._notify(job_id)
+
+    async def _run_item(self, index: int, line: bytes, default_model: Optional[str]) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"index": index}
+        try:
+            item = codec.decode(line)
+            session_id, message = item["session_id"], item["message"]
+        except Exception as e:
+            record["error"] = f"Invalid item: {e}"
+            return record
+
+        record["session_id"] = session_id
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        async with lock, self._endpoint_slot():
+            try:
+                record["reply"] = await self.agent.run_turn(session_id, message, item.get("model") or default_model)
+            except Exception as e:
+                record["error"] = str(e)
+        return record
+
+    # --- Progress ---
+
+    async def _notify(self, job_id: str):
+        condition = self._progress.get(job_id)
+        if condition:
+            async with condition:
+                condition.notify_all()
+
+    async def watch(self, job_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yields the job state on every progress update until the job stops."""
+        condition = self._progress.setdefault(job_id, asyncio.Condition())
+        while True:
+            state = self.get_state(job_id)
+            if state is None:
+                return
+            yield dict(state)
+            if job_id not in self._states:
+                return
+            async with condition:
+                try:
+                    await asyncio.wait_for(condition.wait(), 5)
+                except asyncio.TimeoutError:
+                    pass
@@ -0,0 +1,119 @@
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterable, Set
+
+# Topics published by the Repository
+TOPICS = {"sessions", "messages", "prompts", "activity", "folders", "dashboard", "recordings"}
+# Undelivered events a subscriber may hold before it is told to resync
+MAX_PENDING = 1000
+
+def _merge(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Coalesces two events with the same key: counters add up, other fields take the newest value."""
+    if "delta" in old and "delta" in new:
+        delta = dict(old["delta"])
+        for k, v in new["delta"].items():
+            delta[k] = delta.get(k, 0) + v
+        return {**new, "delta": delta}
+    return new
+
+class Subscription:
+    """One client's view of the bus: a topic filter plus a bounded, coalescing outbox."""
+
+    def __init__(self, bus: "EventBus", topics: Iterable[str], session_id: Optional[str] = None):
+        self.bus = bus
+        self.topics: Set[str] = set(topics) or set(TOPICS)
+        self.session_id = session_id
+        self._pending: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._seq = 0
+        self.dropped = 0
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if event["topic"] not in self.topics:
+            return False
+        return self.session_id is None or event.get("session_id") in (None, self.session_id)
+
+    def offer(self, event: Dict[str, Any]):
+        key = event.get("coalesce")
+        if key is not None and key in self._pending:
+            self._pending[key] = _merge(self._pending[key], event)
+        else:
+            if key is None:
+                self._seq += 1
+                key = ("seq", self._seq)
+            self._pending[key] = event
+        if len(self._pending) > MAX_PENDING:
+            # Slow consumer: drop the backlog and ask it to refetch instead of buffering forever
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            self._pending["resync"] = {"topic": "system", "type": "resync", "ts": time.time()}
+        self._ready.set()
+
+    async def next_batch(self) -> List[Dict[str, Any]]:
+        """Waits for events and returns everything pending, oldest first."""
+        await self._ready.wait()
+        self._ready.clear()
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    """In-process pub/sub for live updates.
+
+    publish() is cheap and safe to call from any thread (repository writes
+    can run in worker threads); delivery always happens on the event loop.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Subscription] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+
+    @property
+    def active(self) -> bool:
+        return self._loop is not None and bool(self._subscribers)
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+
+    def subscribe(self, topics: Iterable[str] = (), session_id: Optional[str] = None) -> Subscription:
+        sub = Subscription(self, topics, session_id)
+        self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if sub in self._subscribers:
+            self._subscribers.remove(sub)
+
+    def publish(self, topic: str, event_type: str, data: Dict[str, Any],
+                session_id: Optional[str] = None, coalesce: Optional[str] = None):
+        if not self.active:
+            return
+        event = {"topic": topic, "type": event_type, "session_id": session_id, "data": data, "ts": time.time()}
+        if coalesce is not None:
+            event["coalesce"] = coalesce
+        self._dispatch(event)
+
+    def publish_delta(self, counters: Dict[str, int]):
+        """Dashboard counter changes; consecutive deltas merge into one event per client."""
+        if not self.active:
+            return
+        self._dispatch({"topic": "dashboard", "type": "stats_delta", "session_id": None,
+                        "delta": counters, "ts": time.time(), "coalesce": "dashboard"})
+
+    def _dispatch(self, event: Dict[str, Any]):
+        if threading.get_ident() == self._loop_thread:
+            self._deliver(event)
+        else:
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: Dict[str, Any]):
+        for sub in self._subscribers:
+            if sub.matches(event):
+                sub.offer(event)
@@ -0,0 +1,317 @@
+import os
+import re
+import time
+import codecs
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from ..persistence.repository import DATA_DIR
+
+# os.pathsep-separated directories to index, e.g. "~/Documents:~/notes"
+FILE_INDEX_ROOTS = os.getenv("FILE_INDEX_ROOTS", "")
+# Files larger than this are listed but their content is not indexed
+FILE_INDEX_MAX_BYTES = int(os.getenv("FILE_INDEX_MAX_BYTES", str(10 * 1024 * 1024)))
+INDEX_FILE = DATA_DIR / "file-index.sqlite"
+
+READ_BLOCK = 64 * 1024
+COMMIT_EVERY = 500             # Changed files per transaction during a refresh
+CHUNK_CHARS = 2000
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".next", ".cache"}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+def check_root(path: Path):
+    """Raises ValueError for a folder too broad to index and expose to read_file:
+    a filesystem root, the home folder or anything containing it."""
+    home = Path.home().resolve()
+    if path == Path(path.anchor) or path == home or path in home.parents:
+        raise ValueError(f"{path} is too broad to index; pick a folder inside it")
+
+def _walk_reaches(root: Path, path: Path) -> bool:
+    """Whether a walk of root indexes path (it skips hidden entries and SKIP_DIRS)."""
+    if path == root:
+        return True
+    if root not in path.parents:
+        return False
+    return not any(p.startswith(".") or p in SKIP_DIRS for p in path.relative_to(root).parts)
+
+def _iter_files(root: Path) -> Iterator[Tuple[str, os.stat_result]]:
+    """Walks root with scandir, yielding (path, stat) for regular files."""
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue  # Hidden files and folders
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            yield entry.path, entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Error scanning {current}: {e}")
+
+def _read_chunks(path: str) -> Tuple[Optional[str], List[str]]:
+    """Streams a file once, returning its content hash and text chunks.
+
+    Binary files (NUL byte in the first block) hash normally but yield no chunks.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    chunks: List[str] = []
+    pending = ""
+    binary = False
+    with open(path, "rb") as f:
+        first = True
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block:
+                break
+            digest.update(block)
+            if first:
+                binary = b"\x00" in block
+                first = False
+            if binary:
+                continue
+            pending += decoder.decode(block)
+            # Cut on line boundaries so chunks stay readable
+            while len(pending) >= CHUNK_CHARS:
+                cut = pending.rfind("\n", 0, CHUNK_CHARS)
+                cut = cut + 1 if cut > 0 else CHUNK_CHARS
+                chunks.append(pending[:cut])
+                pending = pending[cut:]
+    if not binary:
+        pending += decoder.decode(b"", final=True)
+        if pending.strip():
+            chunks.append(pending)
+    return digest.hexdigest(), chunks
+
+class FileIndex:
+    """Incremental full-text index of local files, stored in SQLite FTS5.
+
+    A refresh walks the configured roots and compares each file's
+    (mtime, size) with the stored fingerprint; only changed files are read,
+    and only if their content hash actually changed are their chunks
+    replaced. Files that disappeared are dropped. Roots never overlap: a
+    folder inside an existing root is not added again, and a new root
+    absorbs the roots inside it.
+    """
+
+    def __init__(self, roots: Optional[List[str]] = None, index_file: Path = INDEX_FILE):
+        if roots is None:
+            roots = [r for r in FILE_INDEX_ROOTS.split(os.pathsep) if r]
+        self.roots: List[Path] = []
+        for r in roots:
+            self._add(Path(r).expanduser().resolve())
+        self.index_file = index_file
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()          # Serializes refreshes; readers don't take it
+        self._readers = threading.local()
+        self._cancelled = 0
+        self.last_refresh: Optional[Dict[str, Any]] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.index_file, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY, root TEXT, mtime_ns INTEGER, size INTEGER, hash TEXT
+                );
+                CREATE TABLE IF NOT EXISTS chunk_meta (
+                    id INTEGER PRIMARY KEY, path TEXT, chunk_no INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS chunk_meta_path ON chunk_meta(path);
+                CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+                    content, tokenize='unicode61 remove_diacritics 2'
+                );
+            """)
+            # Folders added at runtime (e.g. by READ prompts) stay indexed across restarts
+            for (root,) in conn.execute("SELECT DISTINCT root FROM files"):
+                try:
+                    check_root(Path(root))
+                except ValueError as e:
+                    print(f"Not restoring index root: {e}")
+                    continue
+                self._add(Path(root))
+            self._conn = conn
+        return self._conn
+
+    @property
+    def reader(self) -> sqlite3.Connection:
+        """This thread's read connection. Under WAL it reads the last commit
+        without waiting for a refresh in progress."""
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            self.conn  # Creates the schema
+            conn = sqlite3.connect(self.index_file)
+            self._readers.conn = conn
+        return conn
+
+    def add_root(self, root: str) -> Path:
+        """Adds a folder to index. Raises ValueError if it is too broad (see check_root)."""
+        path = Path(root).expanduser().resolve()
+        check_root(path)
+        self._add(path)
+        return path
+
+    def _add(self, path: Path):
+        # Overlapping roots would each see the other's files as new and re-chunk them on every refresh
+        if any(_walk_reaches(root, path) for root in self.roots):
+            return
+        self.roots = [root for root in self.roots if not _walk_reaches(path, root)] + [path]
+
+    def is_allowed(self, path: Path) -> bool:
+        return any(path == root or root in path.parents for root in self.roots)
+
+    # --- Indexing ---
+
+    def cancel(self):
+        """Stops refreshes in progress at their next file; what they indexed so far is kept."""
+        self._cancelled += 1
+
+    def refresh(self, roots: Optional[List[Path]] = None) -> Dict[str, Any]:
+        """Brings the index up to date with the filesystem. Safe to call from a thread.
+
+        Changes are committed in batches, so searches see progress and a
+        cancelled refresh keeps what it did.
+        """
+        start = time.perf_counter()
+        generation = self._cancelled
+        stats = {"scanned": 0, "changed": 0, "reindexed": 0, "removed": 0}
+        with self._lock:
+            conn = self.conn
+            for root in roots or self.roots:
+                if self._cancelled != generation:
+                    break
+                if not root.exists():
+                    continue
+                # Fingerprints by path, whichever root indexed the file, except files
+                # under roots nested where this walk doesn't go (e.g. a hidden folder)
+                prefix = str(root).rstrip(os.sep) + os.sep
+                nested = tuple(str(r) + os.sep for r in self.roots if r != root and root in r.parents)
+                known = {
+                    path: (mtime_ns, size, digest)
+                    for path, mtime_ns, size, digest in conn.execute(
+                        "SELECT path, mtime_ns, size, hash FROM files WHERE path = ? OR (path > ? AND path < ?)",
+                        (str(root), prefix, prefix[:-1] + chr(ord(os.sep) + 1)),
+                    )
+                    if not (nested and path.startswith(nested))
+                }
+                if root.is_file():
+                    entries = [(str(root), root.stat())]
+                else:
+                    entries = _iter_files(root)
+                for path, st in entries:
+                    if self._cancelled != generation:
+                        break
+                    stats["scanned"] += 1
+                    previous = known.pop(path, None)
+                    if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+                        continue
+                    stats["changed"] += 1
+                    if self._index_file(conn, str(root), path, st, previous[2] if previous else None):
+                        stats["reindexed"] += 1
+                    if stats["changed"] % COMMIT_EVERY == 0:
+                        conn.commit()
+                else:
+                    # Only a complete walk shows which files are gone
+                    for path in known:
+                        self._remove_file(conn, path)
+                        stats["removed"] += 1
+                conn.commit()
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        if self._cancelled != generation:
+            stats["cancelled"] = True
+        self.last_refresh = stats
+        return stats
+
+    def _index_file(self, conn: sqlite3.Connection, root: str, path: str, st: os.stat_result,
+                    previous_hash: Optional[str]) -> bool:
+        digest, chunks = None, []
+        if st.st_size <= FILE_INDEX_MAX_BYTES:
+            try:
+                digest, chunks = _read_chunks(path)
+            except OSError as e:
+                print(f"Error reading {path}: {e}")
+                return False
+        conn.execute(
+            "INSERT OR REPLACE INTO files (path, root, mtime_ns, size, hash) VALUES (?, ?, ?, ?, ?)",
+            (path, root, st.st_mtime_ns, st.st_size, digest),
+        )
+        if digest is not None and digest == previous_hash:
+            return False  # Touched but not modified
+        self._remove_chunks(conn, path)
+        for chunk_no, text in enumerate(chunks):
+            cur = conn.execute("INSERT INTO chunk_meta (path, chunk_no) VALUES (?, ?)", (path, chunk_no))
+            conn.execute("INSERT INTO chunks (rowid, content) VALUES (?, ?)", (cur.lastrowid, text))
+        return True
+
+    def _remove_chunks(self, conn: sqlite3.Connection, path: str):
+        ids = [(i,) for (i,) in conn.execute("SELECT id FROM chunk_meta WHERE path = ?", (path,))]
+        if ids:
+            conn.executemany("DELETE FROM chunks WHERE rowid = ?", ids)
+            conn.execute("DELETE FROM chunk_meta WHERE path = ?", (path,))
+
+    def _remove_file(self, conn: sqlite3.Connection, path: str):
+        self._remove_chunks(conn, path)
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    # --- Queries ---
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """BM25-ranked chunks matching any word of the query."""
+        words = _WORD_RE.findall(query)
+        if not words:
+            return []
+        match = " OR ".join(f'"{w}"' for w in words)
+        rows = self.reader.execute(
+            """
+            SELECT m.path, m.chunk_no, snippet(chunks, 0, '[', ']', '…', 24), bm25(chunks) AS score
+            FROM chunks JOIN chunk_meta m ON m.id = chunks.rowid
+            WHERE chunks MATCH ? ORDER BY score LIMIT ?
+            """,
+            (match, limit),
+        ).fetchall()
+        return [{"path": p, "chunk": c, "snippet": s, "score": round(-score, 3)} for p, c, s, score in rows]
+
+    def read(self, path: str, offset: int = 0, max_chars: int = 8000) -> Dict[str, Any]:
+        """Reads up to max_chars characters starting at a character offset, streaming from disk."""
+        target = Path(path).expanduser().resolve()
+        if not self.is_allowed(target):
+            raise PermissionError(f"{path} is outside the indexed folders")
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        skipped, parts, taken = 0, [], 0
+        with open(target, "rb") as f:
+            while taken < max_chars:
+                block = f.read(READ_BLOCK)
+                if not block:
+                    break
+                text = decoder.decode(block)
+                if skipped < offset:
+                    drop = min(len(text), offset - skipped)
+                    skipped += drop
+                    text = text[drop:]
+                text = text[:max_chars - taken]
+                parts.append(text)
+                taken += len(text)
+        return {"path": str(target), "offset": offset, "content": "".join(parts), "truncated": taken >= max_chars}
+
+    def status(self) -> Dict[str, Any]:
+        files = self.reader.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        chunks = self.reader.execute("SELECT COUNT(*) FROM chunk_meta").fetchone()[0]
+        return {"roots": [str(r) for r in self.roots], "files": files, "chunks": chunks,
+                "last_refresh": self.last_refresh}
+
+# Initialize global index
+file_index = FileIndex()
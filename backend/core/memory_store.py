@@ -0,0 +1,234 @@
+import os
+import re
+import uuid
+import heapq
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Tuple
+from ..persistence.repository import Repository
+from .output_filter import fold
+
+# Facts at least this similar (Jaccard over character shingles) are merged
+MEMORY_DEDUP_THRESHOLD = float(os.getenv("MEMORY_DEDUP_THRESHOLD", "0.8"))
+
+SHINGLE = 4
+BINS = 64                      # MinHash signature length (one-permutation hashing)
+BANDS = 16                     # LSH bands of BINS // BANDS rows: candidates from ~0.5 similarity
+ROWS = BINS // BANDS
+MAX_EXACT_CHECKS = 8           # Only the candidates sharing the most bands are compared exactly
+_MASK = (1 << 64) - 1
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_NUMBER_RE = re.compile(r"\d+")
+
+def shingles(text: str) -> Set[str]:
+    """Character shingles of the case- and accent-folded words, ignoring punctuation."""
+    normalized = " ".join(_WORD_RE.findall(fold(text)))
+    if len(normalized) <= SHINGLE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE] for i in range(len(normalized) - SHINGLE + 1)}
+
+def numbers(text: str) -> Set[str]:
+    """Facts that differ only in a number ("room 5" / "room 50") are different facts."""
+    return set(_NUMBER_RE.findall(text))
+
+def signature(items: Set[str]) -> Tuple[int, ...]:
+    """One-permutation MinHash: each shingle hashes once into one of BINS bins.
+
+    Empty bins borrow the next non-empty bin's value so short facts still
+    get a full signature. Signatures live in memory only, so the
+    per-process str hash is fine.
+    """
+    sig: List[Optional[int]] = [None] * BINS
+    for item in items:
+        h = hash(item) & _MASK
+        b, v = h % BINS, h // BINS
+        if sig[b] is None or v < sig[b]:
+            sig[b] = v
+    filled = [i for i, v in enumerate(sig) if v is not None]
+    if not filled:
+        return tuple([0] * BINS)
+    for i in range(BINS):
+        if sig[i] is None:
+            nxt = next((j for j in filled if j > i), filled[0])
+            sig[i] = sig[nxt]
+    return tuple(sig)
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return float(a == b)
+    return len(a & b) / len(a | b)
+
+class MemoryStore:
+    """Cross-session memory with near-duplicate consolidation.
+
+    Entries are kept in memory, keyed by id, with an LSH index over their
+    MinHash signatures. A new fact is checked against the index; if a
+    stored fact is similar enough the stored one becomes canonical and its
+    relevance_count goes up instead of a new entry being added. Writes are
+    appended to memory.jsonl; compact() rewrites it to one line per entry.
+    If memory.jsonl couldn't be read, compaction is refused until a reload
+    succeeds, so the unread entries aren't overwritten.
+    """
+
+    def __init__(self, repository: Repository, threshold: float = MEMORY_DEDUP_THRESHOLD):
+        self.repo = repository
+        self.threshold = threshold
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._buckets: Dict[Tuple[int, ...], Set[str]] = {}
+        self._sigs: Dict[str, Tuple[int, ...]] = {}
+        self._journal_records = 0
+        self._load_failed = False
+        self._lock = threading.RLock()
+        # Store operations get their own thread rather than the default to_thread pool chat shares
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory")
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._load()
+        return self._entries
+
+    def _load(self):
+        """Replays the journal, merging duplicates left by older versions."""
+        records = self.repo.load_memory_records()
+        self._load_failed = records is None
+        latest: Dict[str, Dict[str, Any]] = {}
+        for record in records or []:
+            if record.get("deleted"):
+                latest.pop(record.get("id"), None)
+            elif record.get("id"):
+                latest[record["id"]] = record
+        self._entries, self._buckets, self._sigs = {}, {}, {}
+        for entry in latest.values():
+            items = shingles(entry.get("fact", ""))
+            sig = signature(items)
+            match = self._find(entry.get("fact", ""), items, sig)
+            if match:
+                self._merge(match, entry, entry.get("relevance_count", 0) + 1)
+            else:
+                self._index(entry, sig)
+        self._journal_records = len(records or [])
+
+    # --- Index ---
+
+    def _band_keys(self, fact: str, sig: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        # Buckets are split by the fact's numbers so only facts with the same numbers are compared
+        prefix = hash(tuple(sorted(numbers(fact))))
+        return [(band, prefix) + sig[band * ROWS:(band + 1) * ROWS] for band in range(BANDS)]
+
+    def _index(self, entry: Dict[str, Any], sig: Tuple[int, ...]):
+        for key in self._band_keys(entry.get("fact", ""), sig):
+            self._buckets.setdefault(key, set()).add(entry["id"])
+        self._sigs[entry["id"]] = sig
+        self._entries[entry["id"]] = entry
+
+    def _unindex(self, entry_id: str):
+        entry = self._entries.get(entry_id)
+        sig = self._sigs.pop(entry_id, None)
+        if entry is None or sig is None:
+            return
+        for key in self._band_keys(entry.get("fact", ""), sig):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+        self._entries.pop(entry_id, None)
+
+    def _find(self, fact: str, items: Set[str], sig: Tuple[int, ...]) -> Optional[Dict[str, Any]]:
+        """The most similar stored entry above the threshold, checked exactly."""
+        entries = self.entries
+        # Candidates sharing more bands are more likely similar; only the top few are checked
+        hits: Dict[str, int] = {}
+        for key in self._band_keys(fact, sig):
+            for entry_id in self._buckets.get(key, ()):
+                hits[entry_id] = hits.get(entry_id, 0) + 1
+        ranked = heapq.nlargest(MAX_EXACT_CHECKS, hits, key=hits.get)
+        best, best_score = None, self.threshold
+        fact_numbers = numbers(fact)
+        for entry_id in ranked:
+            entry = entries[entry_id]
+            if numbers(entry.get("fact", "")) != fact_numbers:
+                continue
+            score = jaccard(items, shingles(entry.get("fact", "")))
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    def _merge(self, canonical: Dict[str, Any], duplicate: Dict[str, Any], count: int = 1):
+        canonical["relevance_count"] = canonical.get("relevance_count", 0) + count
+        canonical["last_seen"] = duplicate.get("last_seen") or duplicate.get("created_at") or datetime.now().isoformat()
+        sources = canonical.setdefault("source_sessions", [s for s in [canonical.get("source_session")] if s])
+        for source in [duplicate.get("source_session")] + duplicate.get("source_sessions", []):
+            if source and source not in sources:
+                sources.append(source)
+
+    # --- Operations ---
+
+    async def run(self, func, *args):
+        """Runs a store operation (add, remove, compact...) on the store's own thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def add(self, fact: str, category: str = "general", source_session: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Stores a fact, or merges it into a near-duplicate. Returns (entry, merged)."""
+        items = shingles(fact)
+        sig = signature(items)
+        with self._lock:
+            match = self._find(fact, items, sig)
+            if match:
+                self._merge(match, {"source_session": source_session})
+                entry, merged = match, True
+            else:
+                entry = {
+                    "id": f"mem-{uuid.uuid4().hex[:8]}",
+                    "fact": fact,
+                    "category": category,
+                    "source_session": source_session,
+                    "created_at": datetime.now().isoformat(),
+                    "relevance_count": 0,
+                }
+                self._index(entry, sig)
+                merged = False
+            self._journal([entry])
+        return dict(entry), merged
+
+    def remove(self, entry_id: str) -> bool:
+        if entry_id not in self.entries:
+            return False
+        with self._lock:
+            self._unindex(entry_id)
+            self._journal([{"id": entry_id, "deleted": True}])
+        return True
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        entries = list(self.entries.values())
+        return entries[-limit:] if limit else entries
+
+    def _journal(self, records: List[Dict[str, Any]]):
+        self.repo.append_memory_records(records)
+        self._journal_records += len(records)
+        # Merges append a new copy of the entry; keep the file near its live size
+        if self._journal_records > 2 * len(self._entries) + 1000:
+            self.compact()
+
+    def compact(self) -> Dict[str, int]:
+        """Rewrites memory.jsonl with one line per entry. Safe to call from a thread."""
+        with self._lock:
+            entries = self.entries
+            before = self._journal_records
+            if self._load_failed:
+                print("Not compacting memory: memory.jsonl could not be read")
+                return {"records_before": before, "entries": len(entries), "compacted": False}
+            if before != len(entries):
+                self.repo.rewrite_memory(list(entries.values()))
+                self._journal_records = len(entries)
+        return {"records_before": before, "entries": len(entries), "compacted": True}
+
+    def reload(self):
+        """Drops the in-memory state so the next access re-reads memory.jsonl (e.g. after an import)."""
+        with self._lock:
+            self._entries = None
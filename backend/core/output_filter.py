@@ -0,0 +1,185 @@
+import unicodedata
+from functools import lru_cache
+from typing import List, Dict, Tuple, Iterable, Optional
+from ..persistence.models import Prompt, PromptType
+
+# Arabic letter variants folded together so spelling variations still match
+_ARABIC_FOLD = {"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ة": "ه"}
+_TATWEEL = "ـ"
+MASK = "*"
+
+@lru_cache(maxsize=8192)
+def fold_char(c: str) -> str:
+    """Case-, accent- and Arabic-diacritic-insensitive form of one character (may be empty)."""
+    if c in _ARABIC_FOLD:
+        return _ARABIC_FOLD[c]
+    folded = unicodedata.normalize("NFKD", c).casefold()
+    return "".join(
+        _ARABIC_FOLD.get(ch, ch) for ch in folded
+        if not unicodedata.combining(ch) and ch != _TATWEEL
+    )
+
+def fold(text: str) -> str:
+    return "".join(fold_char(c) for c in text)
+
+def _is_word_char(c: Optional[str]) -> bool:
+    if not c:
+        return False
+    return c.isalnum() or c == "_" or c == _TATWEEL or unicodedata.category(c).startswith("M")
+
+class Automaton:
+    """Aho-Corasick automaton over folded patterns."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Tuple[int, ...]] = [()]     # Lengths of patterns ending at each state
+        self.depth: List[int] = [0]
+        for pattern in patterns:
+            self._add(fold(pattern.strip()))
+        self._build()
+
+    def _add(self, pattern: str):
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+                self.depth.append(self.depth[state] + 1)
+                self.goto[state][ch] = nxt
+            state = nxt
+        self.out[state] = (len(pattern),)
+
+    def _build(self):
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def step(self, state: int, ch: str) -> int:
+        goto = self.goto
+        while state and ch not in goto[state]:
+            state = self.fail[state]
+        return goto[state].get(ch, 0)
+
+@lru_cache(maxsize=256)
+def compile_words(words: Tuple[str, ...]) -> Automaton:
+    """Compiled automaton for a sorted, de-duplicated word list (cached)."""
+    return Automaton(words)
+
+class StreamFilter:
+    """Masks forbidden words in text that arrives in chunks.
+
+    Each character is scanned once and the automaton state carries over
+    between chunks, so a word split across chunks is still caught. Text is
+    held back only while it could be part of a match, or while a complete
+    match waits for the next character to confirm its word boundary.
+    """
+
+    def __init__(self, automaton: Automaton):
+        self.ac = automaton
+        self.state = 0
+        self.matches: List[str] = []
+        self._buf: List[str] = []          # Original characters not yet emitted
+        self._mask: List[bool] = []
+        self._base = 0                     # Absolute index of _buf[0]
+        self._norm_orig: List[int] = []    # Original index of each folded character still in play
+        self._pending: List[List[int]] = []  # [start, end] of matches awaiting the closing boundary
+        self._last_emitted: Optional[str] = None
+
+    def _char_before(self, index: int) -> Optional[str]:
+        if index <= self._base:
+            return self._last_emitted
+        return self._buf[index - 1 - self._base]
+
+    def _confirm(self, next_char: Optional[str]):
+        if not _is_word_char(next_char):
+            for start, end in self._pending:
+                self.matches.append("".join(self._buf[start - self._base:end + 1 - self._base]))
+                for i in range(start - self._base, end + 1 - self._base):
+                    self._mask[i] = True
+        self._pending.clear()
+
+    def _push(self, c: str):
+        index = self._base + len(self._buf)
+        folded = fold_char(c)
+        if self._pending:
+            if not folded and _is_word_char(c):
+                # Diacritic or tatweel on the last letter belongs to the match
+                for match in self._pending:
+                    match[1] = index
+            else:
+                self._confirm(c)
+        self._buf.append(c)
+        self._mask.append(False)
+        for ch in folded:
+            self.state = self.ac.step(self.state, ch)
+            self._norm_orig.append(index)
+            for length in self.ac.out[self.state]:
+                start = self._norm_orig[len(self._norm_orig) - length]
+                if not _is_word_char(self._char_before(start)):
+                    self._pending.append([start, index])
+
+    def _drain(self, final: bool) -> str:
+        end = self._base + len(self._buf)
+        safe = end
+        depth = self.ac.depth[self.state]
+        if not final:
+            # Nothing before the start of the current partial match can change any more
+            if depth:
+                safe = self._norm_orig[len(self._norm_orig) - depth]
+            for start, _ in self._pending:
+                safe = min(safe, start)
+        # Folded positions before the partial match can no longer start one
+        drop = len(self._norm_orig) - depth
+        if drop > 0:
+            del self._norm_orig[:drop]
+        count = safe - self._base
+        if count <= 0:
+            return ""
+        out = "".join(MASK if masked else c for c, masked in zip(self._buf[:count], self._mask[:count]))
+        self._last_emitted = self._buf[count - 1]
+        del self._buf[:count]
+        del self._mask[:count]
+        self._base = safe
+        return out
+
+    def feed(self, chunk: str) -> str:
+        """Scans a chunk and returns the text that is now safe to emit."""
+        for c in chunk:
+            self._push(c)
+        return self._drain(final=False)
+
+    def flush(self) -> str:
+        """Ends the stream and returns whatever was held back."""
+        self._confirm(None)
+        return self._drain(final=True)
+
+    def apply(self, text: str) -> str:
+        """Filters a complete text in one go."""
+        return self.feed(text) + self.flush()
+
+def forbidden_words(prompts: Iterable[Prompt]) -> Tuple[str, ...]:
+    """All words from the active FORBIDDEN_WORDS prompts, sorted and de-duplicated."""
+    words = set()
+    for p in prompts:
+        if p.type != PromptType.FORBIDDEN_WORDS.value or p.state != "active":
+            continue
+        listed = p.metadata.get("words") or p.content.split(",")
+        words.update(w.strip() for w in listed if w and w.strip())
+    return tuple(sorted(words))
+
+def filter_for(prompts: Iterable[Prompt]) -> Optional[StreamFilter]:
+    """A fresh StreamFilter for the session's prompts, or None if nothing is forbidden."""
+    words = forbidden_words(prompts)
+    return StreamFilter(compile_words(words)) if words else None
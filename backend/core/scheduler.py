@@ -0,0 +1,227 @@
+import os
+import time
+import json
+import heapq
+import uuid
+import random
+import asyncio
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+from ..persistence.repository import Repository
+from ..persistence.models import ScheduledJob
+from .tools import registry
+
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "4"))
+# Max random delay (seconds) added to each due time so jobs set for the same moment spread out
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0"))
+# Jobs per session per minute; extra jobs are pushed back, not dropped
+SCHEDULER_SESSION_RATE = float(os.getenv("SCHEDULER_SESSION_RATE", "6"))
+# One-shot jobs overdue by more than this after downtime are skipped instead of fired
+SCHEDULER_CATCHUP_WINDOW = float(os.getenv("SCHEDULER_CATCHUP_WINDOW", str(24 * 3600)))
+# Shortest repeat interval (seconds); anything shorter would turn a recurring job into a loop
+SCHEDULER_MIN_INTERVAL = float(os.getenv("SCHEDULER_MIN_INTERVAL", "60"))
+
+class _RateLimiter:
+    """Token bucket per session."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(per_minute, 1.0)
+        self._buckets: Dict[str, List[float]] = {}
+
+    def delay(self, key: str, now: float) -> float:
+        """Takes a token and returns 0, or returns how long to wait for one."""
+        if self.rate <= 0:
+            return 0.0
+        tokens, updated = self._buckets.get(key, [self.capacity, now])
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        if tokens >= 1.0:
+            self._buckets[key] = [tokens - 1.0, now]
+            return 0.0
+        self._buckets[key] = [tokens, now]
+        return (1.0 - tokens) / self.rate
+
+class Scheduler:
+    """Durable in-process scheduler for agent turns and tool invocations.
+
+    Pending jobs live in a min-heap keyed by due time and are journaled to
+    the repository, so they survive restarts. A single dispatcher sleeps
+    until the earliest due time (or until an earlier job is added) and hands
+    due jobs to a bounded pool of workers; nothing polls the filesystem.
+    """
+
+    def __init__(self, repository: Repository, agent, workers: int = SCHEDULER_WORKERS):
+        self.repo = repository
+        self.agent = agent
+        self.workers = workers
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._heap: List[tuple] = []           # (due_at, seq, job_id); stale entries are skipped
+        self._seq = 0
+        self._journal_records = 0
+        self._load_failed = False
+        self._limiter = _RateLimiter(SCHEDULER_SESSION_RATE)
+        self._wakeup = asyncio.Event()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        loaded = self.repo.load_scheduled_jobs()
+        if loaded is None:
+            # Compacting would replace the unreadable journal with an empty one
+            self._load_failed = True
+            loaded = ([], 0)
+        jobs, self._journal_records = loaded
+        now = time.time()
+        for job in jobs:
+            if job.due_at < now - SCHEDULER_CATCHUP_WINDOW:
+                if job.interval:
+                    # Recurring job missed many runs: fire once now, then continue the cadence
+                    job.due_at = now
+                else:
+                    self._log(job, "scheduled_job_missed", {"job_id": job.id})
+                    continue
+            self.jobs[job.id] = job
+            self._push(job)
+        self._compact()
+
+        self._queue = asyncio.Queue(maxsize=self.workers * 2)
+        self._tasks = [asyncio.create_task(self._dispatch())]
+        self._tasks += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # --- Job Management ---
+
+    def schedule(self, session_id: str, due_at: float, kind: str, payload: Dict[str, Any],
+                 prompt_id: Optional[str] = None, interval: Optional[float] = None) -> ScheduledJob:
+        if kind not in ("agent_turn", "tool"):
+            raise ValueError(f"Unknown job kind '{kind}'")
+        if interval is not None and not interval >= SCHEDULER_MIN_INTERVAL:
+            raise ValueError(f"interval must be at least {SCHEDULER_MIN_INTERVAL:g} seconds")
+        job = ScheduledJob(
+            id=f"job-{uuid.uuid4().hex[:12]}",
+            session_id=session_id,
+            due_at=due_at + random.uniform(0, SCHEDULER_JITTER),
+            kind=kind,
+            payload=payload,
+            created_at=datetime.now().isoformat(),
+            prompt_id=prompt_id,
+            interval=interval,
+        )
+        self.jobs[job.id] = job
+        self._journal([{'op': 'put', 'job': job}])
+        self._push(job)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        job = self.jobs.pop(job_id, None)
+        if job is None:
+            return False
+        self._journal([{'op': 'del', 'id': job_id}])
+        return True
+
+    def cancel_for_prompt(self, session_id: str, prompt_id: str) -> int:
+        ids = [j.id for j in self.jobs.values() if j.session_id == session_id and j.prompt_id == prompt_id]
+        for job_id in ids:
+            self.cancel(job_id)
+        return len(ids)
+
+    def list_jobs(self, session_id: Optional[str] = None, limit: int = 100) -> List[ScheduledJob]:
+        jobs = (j for j in self.jobs.values() if session_id is None or j.session_id == session_id)
+        return heapq.nsmallest(limit, jobs, key=lambda j: j.due_at)
+
+    # --- Internals ---
+
+    def _push(self, job: ScheduledJob):
+        self._seq += 1
+        heapq.heappush(self._heap, (job.due_at, self._seq, job.id))
+        if self._heap[0][2] == job.id:
+            self._wakeup.set()
+
+    def _journal(self, records: List[Dict[str, Any]]):
+        self.repo.append_schedule_records(records)
+        self._journal_records += len(records)
+        # Keep the journal within a small multiple of the live job count
+        if self._journal_records > 2 * len(self.jobs) + 1000:
+            self._compact()
+
+    def _compact(self):
+        if self._load_failed:
+            # The journal holds jobs that were never loaded; leave it for a restart to replay
+            return
+        self.repo.rewrite_schedule(list(self.jobs.values()))
+        self._journal_records = len(self.jobs)
+
+    async def _dispatch(self):
+        while True:
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                due_at, _, job_id = heapq.heappop(self._heap)
+                job = self.jobs.get(job_id)
+                if job is None or job.due_at != due_at:
+                    continue  # Cancelled or rescheduled
+                wait = self._limiter.delay(job.session_id, now)
+                if wait > 0:
+                    job.due_at = now + wait
+                    self._push(job)
+                    continue
+                await self._queue.put(job)
+
+            self._wakeup.clear()
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.id in self.jobs:
+                    await self._run(job)
+            except Exception as e:
+                print(f"Scheduled job {job.id} failed: {e}")
+                self._log(job, "scheduled_job_failed", {"job_id": job.id, "error": str(e)})
+            finally:
+                self._finish(job)
+                self._queue.task_done()
+
+    async def _run(self, job: ScheduledJob):
+        if job.kind == "agent_turn":
+            await self.agent.chat(job.session_id, job.payload["message"], job.payload.get("model"))
+            result = None
+        else:
+            # Each run of a job is its own turn, so a recurring call isn't de-duplicated away
+            result, _ = await registry.invoke(job.payload["tool"], json.dumps(job.payload.get("arguments", {})),
+                                              session_id=job.session_id, turn_id=f"{job.id}:{job.runs}")
+        self._log(job, "scheduled_job", {
+            "job_id": job.id, "kind": job.kind, "prompt_id": job.prompt_id, "result": result
+        })
+
+    def _log(self, job: ScheduledJob, event_type: str, data: Dict[str, Any]):
+        try:
+            self.repo.log_activity(job.session_id, event_type, data)
+        except Exception as e:
+            print(f"Error logging scheduler activity: {e}")
+
+    def _finish(self, job: ScheduledJob):
+        if job.id not in self.jobs:
+            return  # Cancelled while running
+        job.runs += 1
+        if job.interval:
+            # Skip runs missed while busy or down instead of firing them back to back
+            # Jobs journaled before intervals were validated may hold a zero or negative one
+            interval = max(job.interval, SCHEDULER_MIN_INTERVAL)
+            job.due_at = max(job.due_at + interval, time.time()) + random.uniform(0, SCHEDULER_JITTER)
+            self._journal([{'op': 'put', 'job': job}])
+            self._push(job)
+        else:
+            del self.jobs[job.id]
+            self._journal([{'op': 'del', 'id': job.id}])
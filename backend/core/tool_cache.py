@@ -0,0 +1,95 @@
+import time
+import json
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from pydantic import BaseModel
+
+class CachePolicy(BaseModel):
+    """Declares how results of a tool may be reused.
+
+    mode="pure": the result depends only on the arguments; reuse it for ttl seconds.
+    mode="idempotent": the tool has side effects; a repeat call with the same
+    key_fields within one turn of one session (the model repeating itself)
+    returns the first result instead of running again. Any later turn runs
+    the tool again, so ttl does not apply.
+    """
+    mode: str = "pure"                 # "pure" or "idempotent"
+    ttl: float = 300.0                 # Seconds a pure result stays valid
+    key_fields: Optional[List[str]] = None  # Arguments that identify a call (default: all)
+
+def cache_key(name: str, args: Dict[str, Any], key_fields: Optional[List[str]] = None,
+              scope: Tuple[Optional[str], ...] = ()) -> str:
+    """Hash of the tool name, its canonical (sorted, compact) JSON arguments and
+    the scope (e.g. session and turn) the result is shared within."""
+    if key_fields is not None:
+        args = {k: args.get(k) for k in key_fields}
+    canonical = json.dumps([list(scope), args], sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{name}\x00{canonical}".encode("utf-8")).hexdigest()
+
+# Idempotent results only need to outlive the turn that produced them
+TURN_TTL = 600.0
+
+class ToolResultCache:
+    """Bounded LRU of tool results with per-entry expiry.
+
+    Concurrent calls with the same key share one execution, so a duplicate
+    side-effecting call issued while the first is still running waits for it
+    instead of running twice.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: str, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_run(self, key: str, ttl: float, run) -> Tuple[str, bool]:
+        """Returns (result, cache_hit). run is an async callable that raises on failure."""
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, True
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending), True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await run()
+        except Exception as e:
+            # Failures are never cached; waiters see the same error
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so an unawaited future doesn't warn
+            raise
+        else:
+            self.put(key, result, ttl)
+            future.set_result(result)
+            return result, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -0,0 +1,155 @@
+import os
+import re
+import math
+import json
+from collections import Counter
+from typing import List, Dict, Any, Optional, Iterable
+from .tools import ToolRegistry
+
+# 0 sends every registered tool on every turn
+TOOL_SELECTION_TOP_K = int(os.getenv("TOOL_SELECTION_TOP_K", "5"))
+# Every Nth turn sends all tools anyway, so calls to tools that selection would
+# have left out show up as misses and recall can be measured (0 never samples)
+TOOL_SELECTION_SAMPLE_EVERY = int(os.getenv("TOOL_SELECTION_SAMPLE_EVERY", "20"))
+UNSENT_LOGGED = 3              # Best-scoring left-out tools included in each record
+# How many earlier messages count towards relevance, and how much less each one weighs
+HISTORY_WINDOW = 4
+HISTORY_DECAY = 0.5
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = {
+    "a", "an", "the", "and", "or", "to", "of", "in", "on", "for", "with", "is", "are",
+    "be", "it", "this", "that", "me", "my", "you", "your", "i", "we", "can", "please",
+    "do", "what", "how", "at", "by", "from", "as", "if", "so", "will", "should",
+}
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens with stop words and plural 's' removed."""
+    tokens = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in _STOPWORDS or tok.isdigit():
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+def _tool_text(definition: Dict[str, Any], keywords: List[str]) -> str:
+    fn = definition["function"]
+    parts = [fn["name"].replace("_", " "), fn.get("description", "")] + keywords
+    for pname, pschema in fn.get("parameters", {}).get("properties", {}).items():
+        parts.append(pname.replace("_", " "))
+        parts.append(pschema.get("description", ""))
+    return " ".join(parts)
+
+class ToolSelector:
+    """Picks the tools worth sending to the model for the current turn.
+
+    Tools are scored by TF-IDF keyword overlap with the user message and,
+    with decaying weight, the last few history messages. Above top_k
+    registered tools, the top_k best are sent; below it, or when nothing
+    matches, all of them are. The index is rebuilt whenever the registry
+    changes.
+    """
+
+    def __init__(self, registry: ToolRegistry, top_k: int = TOOL_SELECTION_TOP_K,
+                 sample_every: int = TOOL_SELECTION_SAMPLE_EVERY):
+        self.registry = registry
+        self.top_k = top_k
+        self.sample_every = sample_every
+        self._version = -1
+        self._index: Dict[str, Counter] = {}
+        self._idf: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self.stats = {"turns": 0, "sampled_turns": 0, "called": 0, "hits": 0}
+
+    def _refresh(self):
+        if self._version == self.registry.version:
+            return
+        definitions = self.registry.get_tool_definitions()
+        tools = self.registry.tools
+        self._index = {
+            d["function"]["name"]: Counter(tokenize(_tool_text(d, tools[d["function"]["name"]].keywords)))
+            for d in definitions
+        }
+        # Serialized size is what the tools cost in the prompt
+        self._sizes = {d["function"]["name"]: len(json.dumps(d)) for d in definitions}
+        df = Counter(tok for terms in self._index.values() for tok in terms)
+        n = len(self._index)
+        self._idf = {tok: math.log(1 + n / count) for tok, count in df.items()}
+        self._version = self.registry.version
+
+    def score(self, message: str, history: Iterable[str] = ()) -> Dict[str, float]:
+        self._refresh()
+        query = Counter()
+        for tok in tokenize(message):
+            query[tok] += 1.0
+        weight = 1.0
+        for text in list(history)[-HISTORY_WINDOW:][::-1]:
+            weight *= HISTORY_DECAY
+            for tok in tokenize(text):
+                query[tok] += weight
+
+        scores = {}
+        for name, terms in self._index.items():
+            scores[name] = sum(
+                q * self._idf.get(tok, 0.0) * (1 + math.log(terms[tok]))
+                for tok, q in query.items() if tok in terms
+            )
+        return scores
+
+    def _prune(self, scores: Dict[str, float]) -> List[str]:
+        """Tool names best first, cut to top_k only when there are more than
+        top_k tools and at least one of them matched."""
+        ranked = sorted(scores, key=lambda n: -scores[n])  # Stable: ties keep registry order
+        if self.top_k <= 0 or len(ranked) <= self.top_k or not any(s > 0 for s in scores.values()):
+            return ranked
+        return ranked[:self.top_k]
+
+    def select(self, message: str, history: Iterable[str] = ()) -> List[str]:
+        """Returns names of the tools to send, best first.
+
+        Every sample_every-th turn returns all tools, so record() can see
+        calls that pruning would have prevented.
+        """
+        scores = self.score(message, history)
+        self.stats["turns"] += 1
+        if self.sample_every > 0 and self.stats["turns"] % self.sample_every == 0:
+            return sorted(scores, key=lambda n: -scores[n])
+        return self._prune(scores)
+
+    def prompt_size(self, names: Optional[List[str]] = None) -> int:
+        """Serialized size in characters of the given tools (all tools if None)."""
+        self._refresh()
+        if names is None:
+            return sum(self._sizes.values())
+        return sum(self._sizes.get(n, 0) for n in names)
+
+    def record(self, sent: List[str], called: List[str], message: str, history: Iterable[str] = ()) -> Dict[str, Any]:
+        """Tracks selection recall: how many called tools pruning would have kept.
+
+        The model can only call tools it was sent, so misses show up on
+        sampled turns only and recall is measured over those. Every record
+        also lists the best-scoring tools pruning left out.
+        """
+        scores = self.score(message, history)
+        selected = self._prune(scores)
+        sampled = len(sent) > len(selected)
+        hits = sum(1 for name in called if name in selected)
+        if sampled:
+            self.stats["sampled_turns"] += 1
+            self.stats["called"] += len(called)
+            self.stats["hits"] += hits
+        total = self.stats["called"]
+        unsent = [n for n in sorted(scores, key=lambda n: -scores[n]) if n not in selected]
+        return {
+            "selected": selected,
+            "sampled": sampled,
+            "called": called,
+            "missed": [name for name in called if name not in selected],
+            "recall": hits / len(called) if called and sampled else None,
+            "cumulative_recall": self.stats["hits"] / total if total else None,
+            "unsent": [{"name": n, "score": round(scores[n], 3)} for n in unsent[:UNSENT_LOGGED]],
+            "prompt_chars": self.prompt_size(sent),
+            "prompt_chars_all": self.prompt_size(),
+        }
@@ -1,50 +1,102 @@
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Optional, Tuple
 import json
+import inspect
 from pydantic import BaseModel
+from .tool_cache import CachePolicy, ToolResultCache, cache_key, TURN_TTL
 
 class Tool(BaseModel):
     name: str
     description: str
     parameters: Dict[str, Any]
     func: Callable
+    keywords: List[str] = []           # Extra terms used for tool selection only
+    cache: Optional[CachePolicy] = None  # None: run on every call
 
 class ToolRegistry:
     def __init__(self):
         self.tools: Dict[str, Tool] = {}
+        self.version = 0
+        self._definitions: Optional[Dict[str, Dict[str, Any]]] = None
+        self.cache = ToolResultCache()
 
-    def register(self, name: str, description: str, parameters: Dict[str, Any], func: Callable):
+    def register(self, name: str, description: str, parameters: Dict[str, Any], func: Callable,
+                 keywords: Optional[List[str]] = None, cache: Optional[CachePolicy] = None):
         self.tools[name] = Tool(
             name=name,
             description=description,
             parameters=parameters,
-            func=func
+            func=func,
+            keywords=keywords or [],
+            cache=cache
         )
+        self.version += 1
+        self._definitions = None
 
-    def get_tool_definitions(self) -> List[Dict[str, Any]]:
-        """Returns tool definitions in OpenAI/Ollama function calling format."""
-        definitions = []
-        for tool in self.tools.values():
-            definitions.append({
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": tool.parameters
+    def _definition_map(self) -> Dict[str, Dict[str, Any]]:
+        # Built once per registry version; registration invalidates it
+        if self._definitions is None:
+            self._definitions = {
+                tool.name: {
+                    "type": "function",
+                    "function": {
+                        "name": tool.name,
+                        "description": tool.description,
+                        "parameters": tool.parameters
+                    }
                 }
-            })
-        return definitions
+                for tool in self.tools.values()
+            }
+        return self._definitions
+
+    def get_tool_definitions(self, names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Returns tool definitions in OpenAI/Ollama function calling format.
+
+        If names is given, only those tools are returned, in that order.
+        """
+        definitions = self._definition_map()
+        if names is None:
+            return list(definitions.values())
+        return [definitions[n] for n in names if n in definitions]
 
     async def call_tool(self, name: str, arguments: str) -> str:
+        result, _ = await self.invoke(name, arguments)
+        return result
+
+    async def invoke(self, name: str, arguments: str, session_id: Optional[str] = None,
+                     turn_id: Optional[str] = None) -> Tuple[str, bool]:
+        """Runs a tool, or reuses a cached result if its policy allows.
+
+        Idempotent tools are de-duplicated within one session and turn only,
+        so another session or a later request runs them again. A suppressed
+        duplicate is reported to the model as {"duplicate": true, ...}.
+        Returns (result, cache_hit).
+        """
         if name not in self.tools:
-            return f"Error: Tool '{name}' not found."
-        
-        try:
-            args = json.loads(arguments)
-            tool = self.tools[name]
-            result = await tool.func(**args) if hasattr(tool.func, "__await__") else tool.func(**args)
+            return f"Error: Tool '{name}' not found.", False
+
+        tool = self.tools[name]
+
+        async def run() -> str:
+            result = tool.func(**args)
+            if inspect.isawaitable(result):
+                result = await result
             return json.dumps(result)
+
+        try:
+            args = json.loads(arguments) if arguments else {}
+            if tool.cache is None:
+                return await run(), False
+            if tool.cache.mode != "idempotent":
+                return await self.cache.get_or_run(cache_key(name, args), tool.cache.ttl, run)
+            key = cache_key(name, args, tool.cache.key_fields, scope=(session_id, turn_id))
+            result, cache_hit = await self.cache.get_or_run(key, TURN_TTL, run)
+            if cache_hit:
+                # Say so, or the model reports the side effect as having happened twice
+                result = json.dumps({"duplicate": True, "detail": "Already done in this turn; not repeated.",
+                                     "result": json.loads(result)})
+            return result, cache_hit
         except Exception as e:
-            return f"Error executing tool '{name}': {str(e)}"
+            return f"Error executing tool '{name}': {str(e)}", False
 
 # Initialize global registry
 registry = ToolRegistry()
@@ -1,14 +1,48 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
-# API Routers
-from .api import sessions, chat, dashboard, tools, prompts, memory, folders, secrets, linkbio, voice, comms
-
 load_dotenv()
 
-app = FastAPI(title="LocalAgent API", version="1.1.0")
+# API Routers (cheap to import: SDK clients and storage are created lazily)
+from .api import sessions, chat, dashboard, tools, prompts, memory, folders, secrets, linkbio, voice, comms, schedule, files, batch, archive, events, recordings
+from .persistence.repository import Repository
+from .core.agent import LocalAgent
+from .core.scheduler import Scheduler
+from .core.file_index import file_index
+from .core.batch import BatchRunner
+from .core.events import EventBus
+from .core.memory_store import MemoryStore
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One repository and agent shared by every router for the app's lifetime
+    app.state.events = EventBus()
+    app.state.events.bind(asyncio.get_running_loop())
+    app.state.repo = Repository(events=app.state.events)
+    app.state.agent = LocalAgent(app.state.repo)
+    app.state.scheduler = Scheduler(app.state.repo, app.state.agent)
+    await app.state.scheduler.start()
+    app.state.batch_runner = BatchRunner(app.state.repo, app.state.agent)
+    app.state.batch_runner.resume_interrupted()
+    # Load memory (merging old duplicates) and rewrite memory.jsonl without them, off the request path
+    app.state.memory = MemoryStore(app.state.repo)
+    compacting = asyncio.create_task(app.state.memory.run(app.state.memory.compact))
+    # Catch the file index up with changes made while the app was down
+    indexing = asyncio.create_task(asyncio.to_thread(file_index.refresh)) if file_index.conn and file_index.roots else None
+    yield
+    await app.state.batch_runner.stop()
+    if indexing:
+        # Stop at the next file instead of waiting for the whole walk
+        file_index.cancel()
+        await indexing
+    await compacting
+    await app.state.scheduler.stop()
+
+app = FastAPI(title="LocalAgent API", version="1.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +64,12 @@ app.include_router(secrets.router)
 app.include_router(linkbio.router)
 app.include_router(voice.router)
 app.include_router(comms.router)
+app.include_router(schedule.router)
+app.include_router(files.router)
+app.include_router(batch.router)
+app.include_router(archive.router)
+app.include_router(events.router)
+app.include_router(recordings.router)
 
 @app.get("/health")
 async def health():
@@ -0,0 +1,209 @@
+import io
+import gzip
+import queue
+import tarfile
+import threading
+from pathlib import Path, PurePosixPath
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple, BinaryIO
+from .repository import Repository
+from .codec import codec
+
+# Streaming backup/restore of the data directory as a compressed tar.
+# zstd needs the optional `zstandard` package; gzip is always available.
+
+CHUNK_SIZE = 256 * 1024
+QUEUE_CHUNKS = 16                      # Export memory bound: QUEUE_CHUNKS * CHUNK_SIZE
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Derived or live files that should not be restored onto another machine
+EXCLUDED_SUFFIXES = (".sqlite", ".sqlite-wal", ".sqlite-shm", ".tmp", ".part")
+# Journals the scheduler and batch runner keep in memory while the app runs;
+# restoring them underneath would be overwritten or resume batches unasked
+RUNTIME_PATHS = ("schedule.jsonl", "batches")
+
+def compressions() -> List[str]:
+    available = ["gzip"]
+    try:
+        import zstandard  # noqa: F401
+        available.append("zstd")
+    except ImportError:
+        pass
+    return available
+
+class _QueueWriter(io.RawIOBase):
+    """File-like sink that hands fixed-size chunks to a bounded queue."""
+
+    def __init__(self, chunks: "queue.Queue"):
+        self._chunks = chunks
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= CHUNK_SIZE:
+            self._chunks.put(bytes(self._buffer[:CHUNK_SIZE]))
+            del self._buffer[:CHUNK_SIZE]
+        return len(data)
+
+    def flush_all(self):
+        if self._buffer:
+            self._chunks.put(bytes(self._buffer))
+            self._buffer.clear()
+
+def _compressor(sink: BinaryIO, compression: str) -> BinaryIO:
+    if compression == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).stream_writer(sink, closefd=False)
+    return gzip.GzipFile(fileobj=sink, mode="wb", compresslevel=6)
+
+def _export_files(repo: Repository, session_ids: Optional[List[str]]) -> Iterator[Tuple[Path, str]]:
+    """Yields (path, archive name) for everything in the export."""
+    if session_ids is None:
+        # Full backup: the whole data directory
+        for path in sorted(repo.data_dir.rglob("*")):
+            relative = path.relative_to(repo.data_dir)
+            if path.is_file() and not path.name.endswith(EXCLUDED_SUFFIXES) and relative.parts[0] not in RUNTIME_PATHS:
+                yield path, relative.as_posix()
+        return
+    for session_id in session_ids:
+        session_dir = repo.sessions_dir / session_id
+        if not session_dir.is_dir():
+            continue
+        for path in sorted(session_dir.rglob("*")):
+            if path.is_file() and not path.name.endswith(EXCLUDED_SUFFIXES):
+                yield path, path.relative_to(repo.data_dir).as_posix()
+
+def export_archive(repo: Repository, session_ids: Optional[List[str]] = None,
+                   compression: str = "gzip") -> Iterator[bytes]:
+    """Streams a compressed tar of the given sessions (or all data) in chunks.
+
+    The tar is produced by a background thread into a bounded queue, so
+    memory stays at a few MB regardless of archive size.
+    """
+    if compression not in compressions():
+        raise ValueError(f"Unsupported compression '{compression}'")
+    wanted = set(session_ids) if session_ids is not None else None
+    chunks: "queue.Queue" = queue.Queue(maxsize=QUEUE_CHUNKS)
+    done = object()
+    cancelled = threading.Event()
+
+    def produce():
+        sink = _QueueWriter(chunks)
+        try:
+            stream = _compressor(sink, compression)
+            with tarfile.open(fileobj=stream, mode="w|") as tar:
+                folders = repo.load_folders()
+                if wanted is not None:
+                    # Only the folders the exported sessions belong to
+                    folders = {
+                        folder_id: {**folder, "sessions": [s for s in folder.get("sessions", []) if s in wanted]}
+                        for folder_id, folder in folders.items()
+                        if any(s in wanted for s in folder.get("sessions", []))
+                    }
+                manifest = codec.encode({"sessions": session_ids, "folders": folders}, pretty=True)
+                info = tarfile.TarInfo("manifest.json")
+                info.size = len(manifest)
+                tar.addfile(info, io.BytesIO(manifest))
+                for path, name in _export_files(repo, session_ids):
+                    if cancelled.is_set():
+                        return
+                    try:
+                        tar.add(path, arcname=name, recursive=False)
+                    except OSError as e:
+                        print(f"Skipping {path} in export: {e}")
+            stream.close()
+            sink.flush_all()
+        except Exception as e:
+            print(f"Export failed: {e}")
+        finally:
+            chunks.put(done)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is done:
+                break
+            yield chunk
+    finally:
+        # Client went away: stop the producer and unblock it
+        cancelled.set()
+        while producer.is_alive():
+            try:
+                chunks.get_nowait()
+            except queue.Empty:
+                producer.join(0.05)
+
+def _open_archive(fileobj: BinaryIO) -> tarfile.TarFile:
+    head = fileobj.read(4)
+    fileobj.seek(0)
+    if head == ZSTD_MAGIC:
+        import zstandard
+        return tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(fileobj), mode="r|")
+    return tarfile.open(fileobj=fileobj, mode="r|*")
+
+def _safe_name(name: str) -> Optional[PurePosixPath]:
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts or not path.parts:
+        return None
+    return path
+
+def import_archive(repo: Repository, fileobj: BinaryIO, session_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Restores an export into the repository.
+
+    Session files are streamed straight to disk; folder membership is
+    collected and written once at the end. If session_ids is given, only
+    those sessions are restored and top-level data files are left alone.
+    Files with EXCLUDED_SUFFIXES and the scheduler and batch journals
+    (RUNTIME_PATHS) are never restored.
+    """
+    wanted = set(session_ids) if session_ids else None
+    imported: Dict[str, str] = {}           # session_id -> folder_id
+    stats = {"sessions": 0, "files": 0, "skipped": 0}
+    manifest_folders: Dict[str, Any] = {}
+
+    with _open_archive(fileobj) as tar:
+        for member in tar:
+            path = _safe_name(member.name)
+            # Derived and in-progress files are never restored, e.g. the live file index
+            if path is None or not member.isfile() or path.name.endswith(EXCLUDED_SUFFIXES):
+                stats["skipped"] += 1
+                continue
+            source = tar.extractfile(member)
+            if path.name == "manifest.json" and len(path.parts) == 1:
+                manifest_folders = codec.decode(source.read()).get("folders") or {}
+                continue
+            if path.parts[0] == "sessions" and len(path.parts) >= 3:
+                session_id = path.parts[1]
+                if wanted is not None and session_id not in wanted:
+                    stats["skipped"] += 1
+                    continue
+                repo.write_data_file(path, source)
+                if session_id not in imported:
+                    imported[session_id] = "default"
+                if path.parts[2:] == ("metadata.json",):
+                    metadata = repo.get_session(session_id)
+                    if metadata:
+                        imported[session_id] = metadata.folder_id
+            elif wanted is None and path.as_posix() != "folders.json" and path.parts[0] not in RUNTIME_PATHS:
+                repo.write_data_file(path, source)
+            else:
+                stats["skipped"] += 1
+                continue
+            stats["files"] += 1
+
+    # One folders.json write for the whole import
+    folders = repo.load_folders()
+    for folder_id, folder in manifest_folders.items():
+        if folder_id not in folders:
+            folders[folder_id] = {**folder, "sessions": []}
+    for session_id, folder_id in imported.items():
+        (repo.sessions_dir / session_id / "recordings").mkdir(exist_ok=True)
+        folder = folders.get(folder_id) or folders.setdefault("default", {"id": "default", "name": "Default", "sessions": []})
+        if session_id not in folder["sessions"]:
+            folder["sessions"].append(session_id)
+    repo.save_folders(folders)
+    stats["sessions"] = len(imported)
+    return stats
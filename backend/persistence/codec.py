@@ -0,0 +1,120 @@
+import os
+import json
+from dataclasses import asdict, is_dataclass
+from typing import Any, List, Optional, Type
+
+# JSON codec used by the repository. msgspec and orjson are optional; the
+# fastest one installed is picked unless LOCALAGENT_JSON_CODEC forces a backend
+# ("msgspec", "orjson" or "json").
+
+_PREFERRED = os.getenv("LOCALAGENT_JSON_CODEC", "").strip().lower()
+
+
+def _default(obj: Any):
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """Stdlib backend. Always available."""
+    name = "json"
+
+    def encode(self, obj: Any, pretty: bool = False) -> bytes:
+        if pretty:
+            return json.dumps(obj, default=_default, indent=2, ensure_ascii=False).encode("utf-8")
+        return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def decode(self, data: bytes, type: Optional[Type] = None) -> Any:
+        obj = json.loads(data)
+        return type(**obj) if type is not None else obj
+
+    def decode_lines(self, data: bytes, type: Optional[Type] = None) -> List[Any]:
+        """Decodes JSONL one line at a time. A line that doesn't decode (a torn
+        last write, a hand edit) is skipped instead of failing the whole file."""
+        items = []
+        skipped = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(self.decode(line, type))
+            except (ValueError, TypeError):
+                skipped += 1
+        if skipped:
+            print(f"Skipped {skipped} undecodable JSONL line(s)")
+        return items
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson backend. Serializes dataclasses natively."""
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def encode(self, obj: Any, pretty: bool = False) -> bytes:
+        option = self._orjson.OPT_INDENT_2 if pretty else 0
+        return self._orjson.dumps(obj, option=option)
+
+    def decode(self, data: bytes, type: Optional[Type] = None) -> Any:
+        obj = self._orjson.loads(data)
+        return type(**obj) if type is not None else obj
+
+
+class MsgspecCodec(JsonCodec):
+    """msgspec backend. Decodes bytes straight into model instances, no dicts in between."""
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._json = msgspec.json
+        self._encoder = msgspec.json.Encoder()
+        self._decoders = {}
+
+    def _decoder(self, type: Optional[Type]):
+        decoder = self._decoders.get(type)
+        if decoder is None:
+            decoder = self._json.Decoder(type) if type is not None else self._json.Decoder()
+            self._decoders[type] = decoder
+        return decoder
+
+    def encode(self, obj: Any, pretty: bool = False) -> bytes:
+        buf = self._encoder.encode(obj)
+        return self._json.format(buf, indent=2) if pretty else buf
+
+    def decode(self, data: bytes, type: Optional[Type] = None) -> Any:
+        return self._decoder(type).decode(data)
+
+    def decode_lines(self, data: bytes, type: Optional[Type] = None) -> List[Any]:
+        try:
+            return self._decoder(type).decode_lines(data)
+        except ValueError:
+            # Fall back to line by line so only the bad lines are lost
+            return super().decode_lines(data, type)
+
+
+_BACKENDS = {
+    "msgspec": MsgspecCodec,
+    "orjson": OrjsonCodec,
+    "json": JsonCodec,
+}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """Returns the named backend, or the fastest installed one."""
+    if name in _BACKENDS:
+        try:
+            return _BACKENDS[name]()
+        except ImportError:
+            print(f"JSON codec '{name}' is not installed, falling back")
+    for backend in _BACKENDS.values():
+        try:
+            return backend()
+        except ImportError:
+            continue
+    return JsonCodec()
+
+
+codec = get_codec(_PREFERRED or None)
@@ -14,7 +14,7 @@ class PromptType(Enum):
     DEBATE = "debate"                  # Debate mode - counterarguments
     INTERVIEW = "interview"            # Interview mode - act as journalist
 
-@dataclass
+@dataclass(slots=True)
 class Prompt:
     """Represents an active prompt"""
     id: str                            # Unique ID
@@ -28,7 +28,7 @@ class Prompt:
     def to_dict(self) -> Dict:
         return asdict(self)
 
-@dataclass
+@dataclass(slots=True)
 class SessionMetadata:
     """Represents session metadata"""
     session_id: str
@@ -40,7 +40,7 @@ class SessionMetadata:
     def to_dict(self) -> Dict:
         return asdict(self)
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Represents a single message in a session"""
     id: str
@@ -51,3 +51,40 @@ class Message:
 
     def to_dict(self) -> Dict:
         return asdict(self)
+
+@dataclass(slots=True)
+class ScheduledJob:
+    """A pending agent turn or tool invocation, persisted by the scheduler"""
+    id: str
+    session_id: str
+    due_at: float                      # Unix timestamp the job should fire at
+    kind: str                          # "agent_turn" or "tool"
+    payload: Dict[str, Any]            # {"message": ...} or {"tool": ..., "arguments": {...}}
+    created_at: str                    # ISO timestamp
+    prompt_id: Optional[str] = None    # SCHEDULE / TIME_TARGET prompt that created it
+    interval: Optional[float] = None   # Seconds between runs for recurring jobs
+    runs: int = 0                      # Times the job has fired
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass(slots=True)
+class Recording:
+    """An audio recording stored in a session's recordings/ folder"""
+    id: str
+    session_id: str
+    timestamp: str                     # ISO timestamp the upload started
+    filename: str                      # File name inside recordings/
+    content_type: str
+    status: str = "uploading"          # "uploading" or "complete"
+    size: int = 0                      # Bytes on disk
+    expected_size: Optional[int] = None  # Total size announced by the client, if any
+    duration: Optional[float] = None   # Seconds
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    language: Optional[str] = None     # For TTS output
+    text_length: Optional[int] = None  # For TTS output
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
@@ -1,24 +1,44 @@
-import json
+import os
 from datetime import datetime
-from pathlib import Path
-from typing import Optional, List, Dict, Any
-from .models import Prompt, SessionMetadata, Message
+import shutil
+from pathlib import Path, PurePosixPath
+from typing import Optional, List, Dict, Any, Tuple, BinaryIO
+from .models import Prompt, SessionMetadata, Message, ScheduledJob, Recording
+from .codec import codec
 
-# Constants for directory paths
-DATA_DIR = Path(__file__).parent.parent / "data"
+# Constants for directory paths (LOCALAGENT_DATA_DIR relocates all data, e.g. for load tests)
+DATA_DIR = Path(os.getenv("LOCALAGENT_DATA_DIR") or Path(__file__).parent.parent / "data")
 SESSIONS_DIR = DATA_DIR / "sessions"
 FOLDERS_FILE = DATA_DIR / "folders.json"
 TEMPLATES_FILE = DATA_DIR / "prompt-templates.json"
+SCHEDULE_FILE = DATA_DIR / "schedule.jsonl"
+MEMORY_FILE = DATA_DIR / "memory.jsonl"
 
 class Repository:
     """Central repository for all data persistence operations."""
 
-    def __init__(self):
+    def __init__(self, events=None):
         self.data_dir = DATA_DIR
         self.sessions_dir = SESSIONS_DIR
         self.folders_file = FOLDERS_FILE
+        self.schedule_file = SCHEDULE_FILE
+        self.memory_file = MEMORY_FILE
+        self.events = events               # Optional EventBus notified of every write
         self._ensure_dirs()
 
+    @property
+    def _live(self) -> bool:
+        """True when someone is listening for live updates."""
+        return self.events is not None and self.events.active
+
+    def _write_json(self, path: Path, obj: Any, pretty: bool = False):
+        with open(path, 'wb') as f:
+            f.write(codec.encode(obj, pretty=pretty))
+
+    def _read_json(self, path: Path, type=None):
+        with open(path, 'rb') as f:
+            return codec.decode(f.read(), type)
+
     def _ensure_dirs(self):
         self.data_dir.mkdir(exist_ok=True)
         self.sessions_dir.mkdir(exist_ok=True)
@@ -41,20 +61,19 @@ class Repository:
             title=title or f"Session {session_id[-8:]}"
         )
 
-        metadata_file = session_dir / "metadata.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata.to_dict(), f, indent=2)
+        self._write_json(session_dir / "metadata.json", metadata)
 
         self.add_session_to_folder(folder_id, session_id)
+        if self._live:
+            self.events.publish("sessions", "created", metadata, session_id)
+            self.events.publish_delta({"totalSessions": 1})
         return metadata
 
     def get_session(self, session_id: str) -> Optional[SessionMetadata]:
         metadata_file = self.sessions_dir / session_id / "metadata.json"
         if metadata_file.exists():
             try:
-                with open(metadata_file, 'r') as f:
-                    data = json.load(f)
-                    return SessionMetadata(**data)
+                return self._read_json(metadata_file, SessionMetadata)
             except Exception as e:
                 print(f"Error loading session metadata: {e}")
         return None
@@ -77,40 +96,41 @@ class Repository:
         if metadata:
             metadata.title = new_title
             metadata.last_modified = datetime.now().isoformat()
-            metadata_file = self.sessions_dir / session_id / "metadata.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata.to_dict(), f, indent=2)
+            self._write_json(self.sessions_dir / session_id / "metadata.json", metadata)
+            if self._live:
+                self.events.publish("sessions", "updated", metadata, session_id, coalesce=f"session:{session_id}")
 
     def save_message(self, session_id: str, message: Message):
         session_dir = self.sessions_dir / session_id
         session_dir.mkdir(parents=True, exist_ok=True)
 
         messages_file = session_dir / "messages.jsonl"
-        with open(messages_file, 'a') as f:
-            f.write(json.dumps(message.to_dict()) + '\n')
+        with open(messages_file, 'ab') as f:
+            f.write(codec.encode(message) + b'\n')
 
         # Update last_modified
         metadata = self.get_session(session_id)
         if metadata:
             metadata.last_modified = datetime.now().isoformat()
-            metadata_file = session_dir / "metadata.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata.to_dict(), f, indent=2)
+            self._write_json(session_dir / "metadata.json", metadata)
+
+        if self._live:
+            self.events.publish("messages", "created", message, session_id)
+            self.events.publish_delta({"totalMessages": 1})
+            if metadata:
+                self.events.publish("sessions", "updated", metadata, session_id, coalesce=f"session:{session_id}")
 
     def load_messages(self, session_id: str) -> List[Message]:
         messages_file = self.sessions_dir / session_id / "messages.jsonl"
         if not messages_file.exists():
             return []
         
-        messages = []
         try:
-            with open(messages_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        messages.append(Message(**json.loads(line)))
+            with open(messages_file, 'rb') as f:
+                return codec.decode_lines(f.read(), Message)
         except Exception as e:
             print(f"Error loading messages: {e}")
-        return messages
+        return []
 
     # --- Prompt Operations ---
 
@@ -119,8 +139,7 @@ class Repository:
         if not prompts_file.exists():
             return []
         try:
-            with open(prompts_file, 'r') as f:
-                data = json.load(f)
+            data = self._read_json(prompts_file)
             return [Prompt(**p) for p in data.get('active_prompts', [])]
         except Exception as e:
             print(f"Error loading prompts: {e}")
@@ -130,8 +149,14 @@ class Repository:
         session_dir = self.sessions_dir / session_id
         session_dir.mkdir(parents=True, exist_ok=True)
         prompts_file = session_dir / "prompts.json"
-        with open(prompts_file, 'w') as f:
-            json.dump({'active_prompts': [p.to_dict() for p in prompts]}, f, indent=2)
+        was_active = self._live and self.get_active_prompt(session_id) is not None
+        self._write_json(prompts_file, {'active_prompts': prompts}, pretty=True)
+        if self._live:
+            self.events.publish("prompts", "updated", {'active_prompts': prompts}, session_id,
+                                coalesce=f"prompts:{session_id}")
+            is_active = any(p.state == "active" for p in prompts)
+            if is_active != was_active:
+                self.events.publish_delta({"activePrompts": 1 if is_active else -1})
 
     def add_prompt(self, session_id: str, prompt: Prompt):
         prompts = self.load_prompts(session_id)
@@ -149,18 +174,25 @@ class Repository:
 
     def load_folders(self) -> Dict:
         try:
-            with open(self.folders_file, 'r') as f:
-                return json.load(f)
+            return self._read_json(self.folders_file)
         except Exception:
             return {'default': {'id': 'default', 'name': 'Default', 'sessions': []}}
 
     def save_folders(self, folders: Dict):
-        with open(self.folders_file, 'w') as f:
-            json.dump(folders, f, indent=2)
+        self._write_json(self.folders_file, folders, pretty=True)
+        if self._live:
+            self.events.publish("folders", "updated", folders, coalesce="folders")
 
     def list_folders(self) -> List[Dict]:
         return list(self.load_folders().values())
 
+    def create_folder(self, folder_id: str, name: str) -> Dict:
+        folders = self.load_folders()
+        folder = {'id': folder_id, 'name': name, 'sessions': []}
+        folders[folder_id] = folder
+        self.save_folders(folders)
+        return folder
+
     def add_session_to_folder(self, folder_id: str, session_id: str):
         folders = self.load_folders()
         if folder_id in folders and session_id not in folders[folder_id]['sessions']:
@@ -186,20 +218,156 @@ class Repository:
             'type': event_type,
             'data': data
         }
-        with open(activity_file, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        with open(activity_file, 'ab') as f:
+            f.write(codec.encode(event) + b'\n')
+        if self._live:
+            self.events.publish("activity", event_type, event, session_id)
 
     def get_activity_log(self, session_id: str, limit: int = 100) -> List[Dict]:
         activity_file = self.sessions_dir / session_id / "activity.jsonl"
         if not activity_file.exists():
             return []
         try:
-            events = []
-            with open(activity_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        events.append(json.loads(line))
+            with open(activity_file, 'rb') as f:
+                events = codec.decode_lines(f.read())
             return events[-limit:]
         except Exception as e:
             print(f"Error reading activity log: {e}")
             return []
+
+    # --- Recording Operations ---
+    # recordings/index.json holds the metadata of every recording in a session;
+    # the audio itself sits next to it, written by the recordings API.
+
+    def recordings_dir(self, session_id: str) -> Path:
+        return self.sessions_dir / session_id / "recordings"
+
+    def load_recordings(self, session_id: str) -> List[Recording]:
+        index_file = self.recordings_dir(session_id) / "index.json"
+        if not index_file.exists():
+            return []
+        try:
+            data = self._read_json(index_file)
+            return [Recording(**r) for r in data.get('recordings', [])]
+        except Exception as e:
+            print(f"Error loading recordings: {e}")
+            return []
+
+    def get_recording(self, session_id: str, recording_id: str) -> Optional[Recording]:
+        for r in self.load_recordings(session_id):
+            if r.id == recording_id:
+                return r
+        return None
+
+    def save_recording(self, session_id: str, recording: Recording):
+        """Adds or replaces one recording's metadata."""
+        recordings = self.load_recordings(session_id)
+        previous = next((r for r in recordings if r.id == recording.id), None)
+        recordings = [r for r in recordings if r.id != recording.id] + [recording]
+        recordings_dir = self.recordings_dir(session_id)
+        recordings_dir.mkdir(parents=True, exist_ok=True)
+        self._write_json(recordings_dir / "index.json", {'recordings': recordings})
+        if self._live:
+            self.events.publish("recordings", "updated", recording, session_id, coalesce=f"recording:{recording.id}")
+            if recording.status == "complete" and (previous is None or previous.status != "complete"):
+                self.events.publish_delta({"totalRecordings": 1})
+
+    def delete_recording(self, session_id: str, recording_id: str) -> Optional[Recording]:
+        recordings = self.load_recordings(session_id)
+        removed = next((r for r in recordings if r.id == recording_id), None)
+        if removed is None:
+            return None
+        self._write_json(self.recordings_dir(session_id) / "index.json",
+                         {'recordings': [r for r in recordings if r.id != recording_id]})
+        if self._live:
+            self.events.publish("recordings", "deleted", {'id': recording_id}, session_id)
+            if removed.status == "complete":
+                self.events.publish_delta({"totalRecordings": -1})
+        return removed
+
+    # --- Bulk Operations ---
+
+    def write_data_file(self, relative_path: PurePosixPath, source: BinaryIO):
+        """Streams source to a path under the data directory, replacing it atomically."""
+        target = self.data_dir.joinpath(*relative_path.parts)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = target.with_name(target.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            shutil.copyfileobj(source, f, 1024 * 1024)
+        tmp_file.replace(target)
+
+    # --- Schedule Operations ---
+    # schedule.jsonl is an append-only journal of {"op": "put", "job": {...}}
+    # and {"op": "del", "id": ...} records; the last record for an id wins.
+
+    def append_schedule_records(self, records: List[Dict[str, Any]]):
+        with open(self.schedule_file, 'ab') as f:
+            f.write(b''.join(codec.encode(r) + b'\n' for r in records))
+
+    def _read_journal(self, path: Path) -> Optional[List[Any]]:
+        """Decodes an append-only journal line by line, skipping lines that don't decode.
+
+        A crash mid-append leaves a partial last record; it is cut off so the
+        next append doesn't get glued onto it. Returns None if the file can't
+        be read, so callers know not to compact over it.
+        """
+        if not path.exists():
+            return []
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            if data and not data.endswith(b'\n'):
+                print(f"Dropping a partial last record from {path.name}")
+                data = data[:data.rfind(b'\n') + 1]
+                with open(path, 'r+b') as f:
+                    f.truncate(len(data))
+        except OSError as e:
+            print(f"Error reading {path.name}: {e}")
+            return None
+        return codec.decode_lines(data)
+
+    def load_scheduled_jobs(self) -> Optional[Tuple[List[ScheduledJob], int]]:
+        """Replays the journal. Returns the live jobs and the number of records read,
+        or None if the journal couldn't be read."""
+        records = self._read_journal(self.schedule_file)
+        if records is None:
+            return None
+        jobs: Dict[str, ScheduledJob] = {}
+        for record in records:
+            try:
+                if record.get('op') == 'put':
+                    jobs[record['job']['id']] = ScheduledJob(**record['job'])
+                else:
+                    jobs.pop(record.get('id'), None)
+            except (AttributeError, KeyError, TypeError) as e:
+                print(f"Skipping malformed schedule record: {e}")
+        return list(jobs.values()), len(records)
+
+    def rewrite_schedule(self, jobs: List[ScheduledJob]):
+        """Compacts the journal down to one put record per live job."""
+        tmp_file = self.schedule_file.with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(b''.join(codec.encode({'op': 'put', 'job': j}) + b'\n' for j in jobs))
+        tmp_file.replace(self.schedule_file)
+
+    # --- Memory Operations ---
+    # memory.jsonl holds one entry per line; a later line with the same id
+    # replaces the earlier one and {"id": ..., "deleted": true} removes it.
+
+    def append_memory_records(self, records: List[Dict[str, Any]]):
+        with open(self.memory_file, 'ab') as f:
+            f.write(b''.join(codec.encode(r) + b'\n' for r in records))
+
+    def load_memory_records(self) -> Optional[List[Dict[str, Any]]]:
+        """The journal's records, or None if it couldn't be read."""
+        records = self._read_journal(self.memory_file)
+        if records is None:
+            return None
+        return [r for r in records if isinstance(r, dict)]
+
+    def rewrite_memory(self, entries: List[Dict[str, Any]]):
+        """Replaces the journal with one line per live entry."""
+        tmp_file = self.memory_file.with_suffix('.jsonl.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(b''.join(codec.encode(e) + b'\n' for e in entries))
+        tmp_file.replace(self.memory_file)
@@ -9,20 +9,36 @@ TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
 TWILIO_WEBHOOK_URL = os.getenv("TWILIO_WEBHOOK_URL")
 
-try:
-    from twilio.rest import Client
-    twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN) if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN else None
-except ImportError:
-    twilio_client = None
+_twilio_client = None
+_twilio_loaded = False
+
+def get_twilio_client():
+    """Imports the Twilio SDK and builds the client on first use."""
+    global _twilio_client, _twilio_loaded
+    if not _twilio_loaded:
+        _twilio_loaded = True
+        if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN:
+            try:
+                from twilio.rest import Client
+                _twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+            except ImportError:
+                _twilio_client = None
+    return _twilio_client
 
 class CommsService:
     def __init__(self):
-        self.client = twilio_client
         self.phone_number = TWILIO_PHONE_NUMBER
         self._active_calls: Dict[str, Any] = {}
 
+    @property
+    def client(self):
+        return get_twilio_client()
+
     def is_enabled(self) -> bool:
-        return self.client is not None and self.phone_number is not None
+        # Check credentials first so a disabled integration never imports the SDK
+        if not (TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN and self.phone_number):
+            return False
+        return self.client is not None
 
     def initiate_call(self, to_number: str, language: str = "en") -> Optional[dict]:
         if not self.is_enabled():
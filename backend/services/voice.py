@@ -1,15 +1,23 @@
 import os
-from io import BytesIO
 from typing import Optional, Dict
-from fastapi.responses import StreamingResponse
 
-# ElevenLabs client (optional)
-try:
-    from elevenlabs.client import ElevenLabs
-    ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
-    elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_API_KEY) if ELEVENLABS_API_KEY else None
-except (ImportError, Exception):
-    elevenlabs_client = None
+# ElevenLabs client (optional, built on first use)
+_elevenlabs_client = None
+_elevenlabs_loaded = False
+
+def get_elevenlabs_client():
+    """Imports the ElevenLabs SDK and builds the client on first use."""
+    global _elevenlabs_client, _elevenlabs_loaded
+    if not _elevenlabs_loaded:
+        _elevenlabs_loaded = True
+        api_key = os.getenv("ELEVENLABS_API_KEY")
+        if api_key:
+            try:
+                from elevenlabs.client import ElevenLabs
+                _elevenlabs_client = ElevenLabs(api_key=api_key)
+            except (ImportError, Exception):
+                _elevenlabs_client = None
+    return _elevenlabs_client
 
 VOICE_MAP = {
     "en": "21m00Tcm4TlvDq8ikWAM",  # English: Bella (default)
@@ -17,8 +25,9 @@ VOICE_MAP = {
 }
 
 class VoiceService:
-    def __init__(self):
-        self.client = elevenlabs_client
+    @property
+    def client(self):
+        return get_elevenlabs_client()
 
     def is_enabled(self) -> bool:
         return self.client is not None